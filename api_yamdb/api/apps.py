@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .slow_queries import install_slow_query_wrapper
+        from .sqlite import apply_pragmas
+
+        connection_created.connect(apply_pragmas)
+        connection_created.connect(install_slow_query_wrapper)
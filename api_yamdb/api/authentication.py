@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+from .constants import USER_CACHE_SIZE, USER_CACHE_TTL
+
+
+class UserCache:
+    """
+    Bounded per-process LRU of user rows. Entries live for a limited
+    time, since other processes can change users without notifying us.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.users = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, pk):
+        with self.lock:
+            user, expires = self.users.get(pk, (None, 0))
+            if user is not None and expires > time.monotonic():
+                self.users.move_to_end(pk)
+                return user
+        user = User.objects.filter(pk=pk).first()
+        if user is not None:
+            with self.lock:
+                self.users[pk] = user, time.monotonic() + self.ttl
+                self.users.move_to_end(pk)
+                while len(self.users) > self.maxsize:
+                    self.users.popitem(last=False)
+        return user
+
+    def forget(self, pk):
+        with self.lock:
+            self.users.pop(pk, None)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication without users table hit on every request. The
+    user row comes from the per-process cache, deleted and inactive
+    users are rejected. Changes made in this process evict the row at
+    once, other processes see them within USER_CACHE_TTL. Cached rows
+    are shared between requests, load a fresh row to change the user.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
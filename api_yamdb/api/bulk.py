@@ -0,0 +1,205 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import serializers, status
+
+from reviews.models import Category, Genre, GenreTitle, Title
+from reviews.search import normalize
+from .cache import invalidate
+from .constants import BULK_MAX_ITEMS
+from .serializers import SlugBulkSerializer, TitleBulkSerializer
+
+TITLE_UPDATE_FIELDS = (
+    'name',
+    'search_name',
+    'year',
+    'description',
+    'category',
+    'version',
+    'modified'
+)
+# Lookup of titles embedding the category or genre in their responses.
+TITLE_LOOKUPS = {Category: 'category__in', Genre: 'genre__in'}
+UNIQUE_MESSAGE = 'The fields name, year, category must make a unique set.'
+
+
+def get_items(request):
+    """Bulk request body should be a list of objects."""
+    if not isinstance(request.data, list):
+        raise serializers.ValidationError(
+            {'non_field_errors': ['Expected a list of items.']}
+        )
+    if len(request.data) > BULK_MAX_ITEMS:
+        raise serializers.ValidationError({'non_field_errors': [
+            f'Ensure there are no more than {BULK_MAX_ITEMS} items.'
+        ]})
+    return request.data
+
+
+def error(errors):
+    return {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors}
+
+
+def validate_items(serializer_class, items, results):
+    """Return (index, validated data) of valid items, report others."""
+    valid = []
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = error(serializer.errors)
+    return valid
+
+
+def bulk_save_slugged(model, items):
+    """
+    Create categories or genres, or rename existing ones with the same
+    slug. Titles of renamed ones are touched, their ETags change.
+    Return result for every item in order of items.
+    """
+    results = [None] * len(items)
+    valid = {}
+    for index, data in validate_items(SlugBulkSerializer, items, results):
+        if data['slug'] in valid:
+            results[index] = error({'slug': ['Duplicate slug in request.']})
+            continue
+        valid[data['slug']] = index, data
+
+    existing = model.objects.in_bulk(list(valid), field_name='slug')
+    created, updated, renamed = [], [], []
+    for slug, (index, data) in valid.items():
+        obj = existing.get(slug)
+        if obj is None:
+            created.append(model(**data))
+            results[index] = {'slug': slug, 'status': status.HTTP_201_CREATED}
+        else:
+            if obj.name != data['name']:
+                renamed.append(obj.pk)
+            obj.name = data['name']
+            obj.search_name = normalize(obj.name)
+            updated.append(obj)
+            results[index] = {'slug': slug, 'status': status.HTTP_200_OK}
+
+    with transaction.atomic():
+        model.objects.bulk_create(created)
+        model.objects.bulk_update(updated, ('name', 'search_name'))
+        if renamed:
+            Title.objects.filter(**{TITLE_LOOKUPS[model]: renamed}).touch()
+    invalidate()
+    return results
+
+
+def build_title(data, titles, categories, genres, now):
+    """Apply item data to a new or existing title. Return (title, errors)."""
+    errors = {}
+    if 'id' in data and data['id'] not in titles:
+        errors['id'] = [f'Invalid pk "{data["id"]}" - object does not exist.']
+    if 'category' in data and data['category'] not in categories:
+        errors['category'] = [
+            f'Object with slug={data["category"]} does not exist.'
+        ]
+    missing = [slug for slug in data.get('genre', ()) if slug not in genres]
+    if missing:
+        errors['genre'] = [
+            f'Object with slug={slug} does not exist.' for slug in missing
+        ]
+    if errors:
+        return None, errors
+
+    title = titles.get(data.get('id')) or Title()
+    for field in ('name', 'year', 'description'):
+        if field in data:
+            setattr(title, field, data[field])
+    if 'category' in data:
+        title.category_id = categories[data['category']]
+    if title.pk is not None:
+        title.search_name = normalize(title.name)
+        title.version = F('version') + 1
+        title.modified = now
+    return title, errors
+
+
+def bulk_save_titles(items):
+    """
+    Create titles or update the ones with 'id' together with their genres.
+    All slugs and titles are resolved with one query per model, rows are
+    written with bulk queries in one transaction. Return result for every
+    item in order of items.
+    """
+    results = [None] * len(items)
+    valid = validate_items(TitleBulkSerializer, items, results)
+
+    category_slugs = {data['category'] for _, data in valid
+                      if 'category' in data}
+    genre_slugs = {slug for _, data in valid for slug in data.get('genre', ())}
+    categories = dict(Category.objects.filter(
+        slug__in=category_slugs
+    ).values_list('slug', 'pk'))
+    genres = dict(Genre.objects.filter(
+        slug__in=genre_slugs
+    ).values_list('slug', 'pk'))
+    titles = Title.objects.in_bulk(
+        [data['id'] for _, data in valid if 'id' in data]
+    )
+
+    now = timezone.now()
+    seen = {}
+    for index, data in valid:
+        title, errors = build_title(data, titles, categories, genres, now)
+        if errors:
+            results[index] = error(errors)
+            continue
+        key = title.name, title.year, title.category_id
+        if key in seen:
+            results[index] = error({'non_field_errors': [UNIQUE_MESSAGE]})
+            continue
+        seen[key] = index, title, data
+
+    existing = Title.objects.filter(
+        name__in={name for name, _, _ in seen}
+    ).values_list('pk', 'name', 'year', 'category_id')
+    for pk, *key in existing:
+        key = tuple(key)
+        if key in seen and key[2] is not None and seen[key][1].pk != pk:
+            results[seen.pop(key)[0]] = error(
+                {'non_field_errors': [UNIQUE_MESSAGE]}
+            )
+
+    created = [title for _, title, _ in seen.values() if title.pk is None]
+    updated = [title for _, title, _ in seen.values() if title.pk is not None]
+    with transaction.atomic():
+        Title.objects.bulk_create(created)
+        Title.objects.bulk_update(updated, TITLE_UPDATE_FIELDS)
+        if created:
+            # Backends other than PostgreSQL don't return pks from bulk
+            # insert. New titles are unique by name, year and category.
+            new_pks = {
+                tuple(key): pk for pk, *key in Title.objects.filter(
+                    name__in={title.name for title in created}
+                ).values_list('pk', 'name', 'year', 'category_id')
+            }
+            for title in created:
+                title.pk = new_pks[title.name, title.year, title.category_id]
+        GenreTitle.objects.filter(title__in=[
+            title for title in updated if 'genre' in seen[
+                title.name, title.year, title.category_id
+            ][2]
+        ]).delete()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title.pk, genre_id=genres[slug])
+            for _, title, data in seen.values()
+            for slug in set(data.get('genre', ()))
+        )
+    invalidate()
+
+    created_pks = {title.pk for title in created}
+    for index, title, _ in seen.values():
+        results[index] = {
+            'id': title.pk,
+            'status': (
+                status.HTTP_201_CREATED if title.pk in created_pks
+                else status.HTTP_200_OK
+            )
+        }
+    return results
@@ -0,0 +1,97 @@
+from functools import partial
+from hashlib import md5
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework.response import Response
+
+CACHE_ALIAS = 'api'
+GENERATION_KEY = 'api:generation'
+STATS_KEYS = {'hits': 'api:stats:hits', 'misses': 'api:stats:misses'}
+
+
+def invalidate():
+    """
+    Drop every cached response at once by changing cache generation.
+    Stale entries are never read again and expire by timeout.
+    """
+    caches[CACHE_ALIAS].set(
+        GENERATION_KEY, (uuid4().hex, timezone.now()), None
+    )
+
+
+def get_generation():
+    """Return (token, changed) pair of current catalog generation."""
+    cache = caches[CACHE_ALIAS]
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, (uuid4().hex, timezone.now()), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def get_stats():
+    """Return hit and miss counters of the response cache."""
+    values = caches[CACHE_ALIAS].get_many(STATS_KEYS.values())
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def count(name):
+    cache = caches[CACHE_ALIAS]
+    key = STATS_KEYS[name]
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_cache_key(request, generation):
+    """Key depends on url and normalized query string (sorted params)."""
+    query = urlencode(sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    ))
+    url = request.build_absolute_uri(request.path)
+    digest = md5(f'{url}?{query}'.encode()).hexdigest()
+    return f'api:response:{generation}:{digest}'
+
+
+def cached_response(request, get_response):
+    """
+    Serve request from response cache, call get_response on a miss.
+    Cache is invalidated on catalog changes by signals, see api.signals.
+    Responses are built from primary, a lagging replica would keep data
+    invalidated by the last commit in the cache until timeout.
+    """
+    # Router module depends on metrics, which imports this one.
+    from .db_routers import primary_reads
+
+    cache = caches[CACHE_ALIAS]
+    token, _ = get_generation()
+    key = get_cache_key(request, token)
+    data = cache.get(key)
+    if data is not None:
+        count('hits')
+        return Response(data, headers={'X-Cache': 'HIT'})
+
+    count('misses')
+    with primary_reads(request):
+        response = get_response()
+    if response.status_code == 200:
+        cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+    response['X-Cache'] = 'MISS'
+    return response
+
+
+class CachedListMixin:
+    """Serve list action from response cache."""
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request, partial(super().list, request, *args, **kwargs)
+        )
@@ -0,0 +1,72 @@
+from hashlib import md5
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from reviews.models import Title
+from .cache import get_generation
+
+
+def title_stamp(request, pk=None, **kwargs):
+    return Title.objects.filter(pk=pk).values_list(
+        'pk', 'version', 'modified'
+    ).first()
+
+
+def review_stamp(request, title_id=None, **kwargs):
+    return title_stamp(request, pk=title_id)
+
+
+def comment_stamp(request, review_id=None, **kwargs):
+    """Comments belong to the title of their review, not of the url."""
+    return Title.objects.filter(reviews=review_id).values_list(
+        'pk', 'version', 'modified'
+    ).first()
+
+
+def title_list_stamp(request, **kwargs):
+    """Catalog generation of the response cache changes on any title change."""
+    token, changed = get_generation()
+    return token, 0, changed
+
+
+def get_stamp(stamp_func, request, kwargs):
+    """
+    Return (etag, last_modified) or None if object doesn't exist.
+    Computed once per request, since both condition callbacks need it.
+    """
+    if not hasattr(request, '_conditional_stamp'):
+        stamp = stamp_func(request, **kwargs)
+        if stamp is None or stamp[2] is None:
+            request._conditional_stamp = None
+        else:
+            pk, version, modified = stamp
+            parts = (
+                request.get_full_path(),
+                request.accepted_renderer.format,
+                pk,
+                version,
+                modified.isoformat()
+            )
+            etag = md5(repr(parts).encode()).hexdigest()
+            request._conditional_stamp = etag, modified
+    return request._conditional_stamp
+
+
+def conditional(stamp_func):
+    """
+    Decorator for viewset read actions. Adds strong ETag and Last-Modified
+    headers computed from title version stamp without rendering the body
+    and answers If-None-Match and If-Modified-Since with 304.
+    """
+    def etag(request, *args, **kwargs):
+        stamp = get_stamp(stamp_func, request, kwargs)
+        return stamp and stamp[0]
+
+    def last_modified(request, *args, **kwargs):
+        stamp = get_stamp(stamp_func, request, kwargs)
+        return stamp and stamp[1]
+
+    return method_decorator(
+        condition(etag_func=etag, last_modified_func=last_modified)
+    )
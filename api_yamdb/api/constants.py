@@ -1 +1,13 @@
 EMAIL_FROM = 'no-reply@example.com'
+USER_CACHE_SIZE = 1024
+USER_CACHE_TTL = 60
+BULK_MAX_ITEMS = 1000
+EXPORT_CHUNK_SIZE = 2000
+METRICS_DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+METRICS_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLOW_QUERY_MAX_SQL_LENGTH = 2000
+SLOW_QUERY_STACK_DEPTH = 3
+TOP_TITLES_LIMIT = 10
+TOP_TITLES_MAX_LIMIT = 100
@@ -0,0 +1,91 @@
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from .metrics import current_request
+
+PRIMARY = 'default'
+REPLICA_VIEWS_MODULE = 'api.views'
+PIN_COOKIE = 'primary_pin'
+PIN_SALT = 'api.db_routers.pin'
+
+
+@contextmanager
+def primary_reads(request):
+    """Read from primary inside the block, e.g. to fill shared caches."""
+    request = getattr(request, '_request', request)
+    previous = getattr(request, 'read_primary', False)
+    request.read_primary = True
+    try:
+        yield
+    finally:
+        request.read_primary = previous
+
+
+def reads_from_replica(request):
+    """Safe request to API viewsets from a client not pinned to primary."""
+    if (request is None or request.method not in SAFE_METHODS
+            or getattr(request, 'read_primary', False)):
+        return False
+    match = request.resolver_match
+    view = getattr(match.func, 'cls', None) if match else None
+    return view is not None and view.__module__ == REPLICA_VIEWS_MODULE
+
+
+class ReplicaRouter:
+    """
+    Send reads of safe requests to API viewsets to a random replica
+    from DATABASE_REPLICAS, everything else to primary. Replicas hold
+    the same data, so relations between any of databases are allowed.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and reads_from_replica(
+            current_request.get()
+        ):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-your-writes for replicas. A client making a successful write
+    gets a signed cookie with a timestamp and reads from primary for
+    REPLICA_PIN_SECONDS, until replicas catch up. The pin lives on the
+    client, so it works whatever process serves the next request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        request.read_primary = request.get_signed_cookie(
+            PIN_COOKIE,
+            default=None,
+            salt=PIN_SALT,
+            max_age=settings.REPLICA_PIN_SECONDS
+        ) is not None
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_signed_cookie(
+                PIN_COOKIE,
+                '1',
+                salt=PIN_SALT,
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
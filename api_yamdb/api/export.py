@@ -0,0 +1,52 @@
+import json
+from collections import defaultdict
+from itertools import islice
+
+from reviews.models import Review
+from .constants import EXPORT_CHUNK_SIZE
+from .row_serializers import (
+    REVIEW_FIELDS,
+    TITLE_FIELDS,
+    ReviewRowSerializer,
+    TitleRowSerializer
+)
+
+
+def get_chunks(iterator, size):
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_reviews(title_ids):
+    reviews = defaultdict(list)
+    serializer = ReviewRowSerializer()
+    rows = Review.objects.filter(title_id__in=title_ids).values(
+        'title_id', *REVIEW_FIELDS
+    ).order_by('title_id', 'pub_date', 'id')
+    for row in rows:
+        reviews[row['title_id']].append(serializer.to_representation(row))
+    return reviews
+
+
+def export_titles(queryset, with_reviews=False, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield titles as lines of JSON in the TitleSerializer format.
+    Titles are read through a server-side cursor, genres and reviews
+    are fetched with one query per chunk, so memory does not depend
+    on the size of the catalog.
+    """
+    rows = queryset.order_by('pk').values(*TITLE_FIELDS).iterator(
+        chunk_size=chunk_size
+    )
+    for chunk in get_chunks(rows, chunk_size):
+        titles = TitleRowSerializer(chunk, many=True).data
+        if with_reviews:
+            reviews = get_reviews([title['id'] for title in titles])
+            for title in titles:
+                title['reviews'] = reviews[title['id']]
+        yield ''.join(
+            json.dumps(title, ensure_ascii=False) + '\n' for title in titles
+        )
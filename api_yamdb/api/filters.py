@@ -1,10 +1,54 @@
 from django_filters import ModelMultipleChoiceFilter, FilterSet, CharFilter
+from rest_framework.filters import OrderingFilter, SearchFilter
 
 from reviews.models import Category, Genre, Title
+from reviews.search import normalize, prefix_lookup, search_titles
+
+
+class NormalizedSearchFilter(SearchFilter):
+    """
+    Case-insensitive (Cyrillic included) search of names starting with
+    the search term. Uses indexed normalized 'search_name' column.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        value = normalize(request.query_params.get(self.search_param, ''))
+        if not value:
+            return queryset
+        return queryset.filter(**prefix_lookup('search_name', value))
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """
+    Ordering of titles by 'rating', 'year' or 'name' (descending with '-').
+    Ties are broken by the next columns of the field index in the same
+    direction, so the database walks the index instead of sorting.
+    """
+    ordering_fields = ('rating', 'year', 'name')
+    tie_breakers = {'rating': ('pk',), 'year': ('name',)}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        result = []
+        for term in ordering:
+            field = term.lstrip('-')
+            prefix = term[:len(term) - len(field)]
+            result.append(term)
+            result.extend(
+                prefix + tie_breaker
+                for tie_breaker in self.tie_breakers.get(field, ())
+            )
+        return result
 
 
 class TitleFilters(FilterSet):
-    """Filtering for TitleViewSet. Nested slug field filter implemented."""
+    """
+    Filtering for TitleViewSet. Nested slug field filter implemented.
+    'name' is case-insensitive search of names starting with the value,
+    'search' is full text search by name and description ordered by relevance.
+    """
     genre = ModelMultipleChoiceFilter(
         field_name='genre__slug',
         to_field_name='slug',
@@ -15,8 +59,17 @@ class TitleFilters(FilterSet):
         to_field_name='slug',
         queryset=Category.objects.all()
     )
-    name = CharFilter(lookup_expr='contains')
+    name = CharFilter(method='filter_name')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('genre', 'category', 'year', 'name')
+        fields = ('genre', 'category', 'year', 'name', 'search')
+
+    def filter_name(self, queryset, name, value):
+        if not normalize(value):
+            return queryset
+        return queryset.filter(**prefix_lookup('search_name', value))
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
@@ -0,0 +1,43 @@
+"""
+Logging handlers. Imported by logging configuration before apps are
+loaded, so this module must not import models or views.
+"""
+import atexit
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+class QueueFileHandler(QueueHandler):
+    """
+    Rotating file handler which does not block the caller: records are
+    put into a queue and written to the file by a listener thread.
+    """
+
+    def __init__(self, filename, maxBytes=0, backupCount=0):
+        super().__init__(queue.SimpleQueue())
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        self.file_handler = RotatingFileHandler(
+            filename,
+            maxBytes=maxBytes,
+            backupCount=backupCount,
+            encoding='utf-8',
+            delay=True
+        )
+        self.listener = QueueListener(self.queue, self.file_handler)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        self.file_handler.setFormatter(fmt)
+
+    def prepare(self, record):
+        """Format in the listener thread, message is ready already."""
+        return record
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+            self.file_handler.close()
+        super().close()
@@ -0,0 +1,223 @@
+import json
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack
+from contextvars import ContextVar
+from threading import Lock
+
+from django.db import connections
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .cache import get_stats
+from .constants import METRICS_DURATION_BUCKETS, METRICS_QUERY_BUCKETS
+from .permissions import IsAdmin
+
+HISTOGRAMS = (
+    ('api_request_duration_seconds', 'Time to process request.',
+     METRICS_DURATION_BUCKETS),
+    ('api_db_duration_seconds', 'Time spent in database queries.',
+     METRICS_DURATION_BUCKETS),
+    ('api_db_queries', 'Database queries per request.',
+     METRICS_QUERY_BUCKETS),
+    ('api_serializer_duration_seconds', 'Time to build serializer data.',
+     METRICS_DURATION_BUCKETS),
+)
+
+
+class Histogram:
+    """Bucket counters with sum and count of observed values."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, view):
+        """Lines of Prometheus text format, buckets are cumulative."""
+        labels = f'view="{view}"'
+        lines, total = [], 0
+        bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class Registry:
+    """Per-process metrics of every view and action."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.clear()
+
+    def clear(self):
+        self.histograms = {
+            name: defaultdict(lambda buckets=buckets: Histogram(buckets))
+            for name, _, buckets in HISTOGRAMS
+        }
+        self.requests = defaultdict(int)
+
+    def observe(self, view, status, total, timings):
+        values = (total, timings.db, timings.queries, timings.serializer)
+        with self.lock:
+            for (name, _, _), value in zip(HISTOGRAMS, values):
+                self.histograms[name][view].observe(value)
+            self.requests[view, status] += 1
+
+    def render(self):
+        lines = [
+            '# HELP api_requests_total Processed requests.',
+            '# TYPE api_requests_total counter',
+        ]
+        with self.lock:
+            for (view, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'api_requests_total{{view="{view}",status="{status}"}} '
+                    f'{count}'
+                )
+            for name, description, _ in HISTOGRAMS:
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for view, histogram in sorted(self.histograms[name].items()):
+                    lines.extend(histogram.render(name, view))
+        for name, value in get_stats().items():
+            metric = f'api_cache_{name}_total'
+            lines.append(f'# HELP {metric} Response cache {name}.')
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+# Request being processed, lets database wrappers know the view.
+current_request = ContextVar('current_request', default=None)
+
+
+class Timings:
+    """Database and serializer time of one request."""
+
+    def __init__(self):
+        self.db = 0
+        self.queries = 0
+        self.serializer = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def header(self, total):
+        return (
+            f'total;dur={total * 1000:.2f}, '
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f'serializer;dur={self.serializer * 1000:.2f}'
+        )
+
+
+def get_view_name(request):
+    """ViewSet.action, APIView.method or url name for other views."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None:
+        return match.view_name
+    method = request.method.lower()
+    actions = getattr(match.func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class MetricsMiddleware:
+    """
+    Measure total, database and serializer time and query count of
+    every request. Send them in Server-Timing header and aggregate
+    into histograms by view for the metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = request.timings = Timings()
+        token = current_request.set(request)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        total = time.perf_counter() - started
+        registry.observe(
+            get_view_name(request), response.status_code, total, timings
+        )
+        response['Server-Timing'] = timings.header(total)
+        return response
+
+
+class TimedSerializer:
+    """Serializer proxy adding time of building its data to timings."""
+
+    def __init__(self, serializer, timings):
+        self.serializer = serializer
+        self.timings = timings
+
+    @property
+    def data(self):
+        started = time.perf_counter()
+        data = self.serializer.data
+        self.timings.serializer += time.perf_counter() - started
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self.serializer, name)
+
+
+class SerializerTimingMixin:
+    """Count serializer time of the view in request timings."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        timings = getattr(self.request, 'timings', None)
+        if timings is None:
+            return serializer
+        return TimedSerializer(serializer, timings)
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, str):
+            data = json.dumps(data)
+        return data.encode(self.charset)
+
+
+class MetricsView(APIView):
+    """Metrics of this process in Prometheus text format."""
+    permission_classes = (IsAdmin,)
+    renderer_classes = (PrometheusRenderer,)
+
+    def get(self, request):
+        return Response(
+            registry.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
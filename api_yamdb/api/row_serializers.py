@@ -0,0 +1,191 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from reviews.models import SCORES, SCORE_FIELDS, GenreTitle
+
+TITLE_FIELDS = (
+    'id',
+    'name',
+    'year',
+    'rating',
+    'description',
+    'category__name',
+    'category__slug'
+)
+REVIEW_FIELDS = (
+    'id',
+    'text',
+    'author__username',
+    'score',
+    'pub_date'
+)
+COMMENT_FIELDS = (
+    'id',
+    'text',
+    'author__username',
+    'pub_date'
+)
+datetime_field = serializers.DateTimeField()
+weighted_rating_field = serializers.DecimalField(
+    max_digits=4,
+    decimal_places=2,
+    coerce_to_string=False
+)
+
+
+def get_genres(title_ids):
+    """Genres of every title ordered as Genre model, one query."""
+    genres = defaultdict(list)
+    rows = GenreTitle.objects.filter(title_id__in=title_ids).values_list(
+        'title_id', 'genre__name', 'genre__slug'
+    ).order_by('genre__name', 'genre_id')
+    for title_id, name, slug in rows:
+        genres[title_id].append({'name': name, 'slug': slug})
+    return genres
+
+
+class RowSerializer:
+    """
+    Read-only serializer of values() rows. Output is the same as of the
+    model serializer it stands for, but every row is copied into a dict
+    by hand, no field objects are built or dispatched to.
+    """
+    fields = ()
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    def get_fields(self):
+        """Lookups of values() call, keys of the rows."""
+        return self.fields
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.get_fields())
+
+    def prepare(self, rows):
+        """Fetch data shared by the rows, called once before them."""
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    @property
+    def data(self):
+        if not self.many:
+            self.prepare([self.instance])
+            return self.to_representation(self.instance)
+        rows = list(self.instance)
+        self.prepare(rows)
+        return [self.to_representation(row) for row in rows]
+
+
+class TitleRowSerializer(RowSerializer):
+    """TitleSerializer format, genres of all rows are fetched at once."""
+    fields = TITLE_FIELDS
+
+    def get_fields(self):
+        if self.context.get('score_histogram'):
+            return self.fields + SCORE_FIELDS
+        return self.fields
+
+    def prepare(self, rows):
+        self.genres = get_genres([row['id'] for row in rows])
+
+    def to_representation(self, row):
+        rating = row['rating']
+        data = {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'rating': None if rating is None else int(rating),
+            'description': row['description'],
+            'genre': self.genres[row['id']],
+            'category': (
+                None if row['category__slug'] is None
+                else {
+                    'name': row['category__name'],
+                    'slug': row['category__slug']
+                }
+            ),
+        }
+        if self.context.get('score_histogram'):
+            data['score_histogram'] = {
+                str(score): row[field]
+                for score, field in zip(SCORES, SCORE_FIELDS)
+            }
+        return data
+
+
+class TopTitleRowSerializer(TitleRowSerializer):
+    """TopTitleSerializer format."""
+    fields = TITLE_FIELDS + ('weighted_rating',)
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        weighted_rating = row['weighted_rating']
+        data['weighted_rating'] = (
+            None if weighted_rating is None
+            else weighted_rating_field.to_representation(weighted_rating)
+        )
+        return data
+
+
+class ReviewRowSerializer(RowSerializer):
+    """ReviewSerializer format."""
+    fields = REVIEW_FIELDS
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'score': row['score'],
+            'pub_date': datetime_field.to_representation(row['pub_date']),
+        }
+
+
+class CommentRowSerializer(RowSerializer):
+    """CommentSerializer format."""
+    fields = COMMENT_FIELDS
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'pub_date': datetime_field.to_representation(row['pub_date']),
+        }
+
+
+class RowSerializerMixin:
+    """
+    Serve safe requests of actions in row_serializer_classes from
+    values() rows. Filtered queryset of these actions yields rows, so
+    get_object returns a row too. Other requests, including forms of
+    the browsable API, use the model serializers.
+    """
+    row_serializer_classes = {}
+
+    def get_row_serializer_class(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+        return self.row_serializer_classes.get(self.action)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_row_serializer_class()
+        if serializer_class is None:
+            return queryset
+        return serializer_class(
+            context=self.get_serializer_context()
+        ).values(queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = self.get_row_serializer_class()
+        if serializer_class is None:
+            return super().get_serializer(*args, **kwargs)
+        kwargs['context'] = self.get_serializer_context()
+        return serializer_class(*args, **kwargs)
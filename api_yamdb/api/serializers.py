@@ -3,7 +3,14 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from rest_framework import serializers, validators
 
 from reviews.constants import MAX_SCORE_VALUE, MIN_SCORE_VALUE
-from reviews.models import Category, Genre, Title, Review, Comment
+from reviews.models import (
+    Category,
+    Genre,
+    Title,
+    Review,
+    Comment,
+    NotOverCurrentYearValidator
+)
 from users.models import User
 
 username_validator = UnicodeUsernameValidator()
@@ -24,11 +31,18 @@ class GenreSerializer(serializers.ModelSerializer):
 
 
 class TitleSerializer(serializers.ModelSerializer):
-    """Serializer for Title model. Only for GET requests."""
+    """
+    Serializer for Title model. Only for GET requests. Stored histogram
+    of review scores is added with 'score_histogram' context flag.
+    """
     category = CategorySerializer()
     genre = GenreSerializer(many=True)
     description = serializers.CharField(required=False)
     rating = serializers.IntegerField(read_only=True)
+    score_histogram = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True
+    )
 
     class Meta:
         model = Title
@@ -39,9 +53,41 @@ class TitleSerializer(serializers.ModelSerializer):
             'rating',
             'description',
             'genre',
-            'category'
+            'category',
+            'score_histogram'
         )
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get('score_histogram'):
+            del fields['score_histogram']
+        return fields
+
+
+class TopTitleSerializer(TitleSerializer):
+    """Title of the leaderboard with its weighted rating."""
+    weighted_rating = serializers.DecimalField(
+        max_digits=4,
+        decimal_places=2,
+        coerce_to_string=False,
+        read_only=True
+    )
+
+    class Meta(TitleSerializer.Meta):
+        fields = TitleSerializer.Meta.fields + ('weighted_rating',)
+
+
+class ScoreHistogramSerializer(serializers.ModelSerializer):
+    """Number of reviews of the title with every score."""
+    score_histogram = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True
+    )
+
+    class Meta:
+        model = Title
+        fields = ('id', 'rating_count', 'score_histogram')
+
 
 class TitleSerializerPostUpdate(TitleSerializer):
     """Serializer for Title model. POST, PATCH and DELETE requests."""
@@ -56,6 +102,50 @@ class TitleSerializerPostUpdate(TitleSerializer):
     )
 
 
+class SlugBulkSerializer(serializers.Serializer):
+    """
+    Item of categories and genres bulk request. Existing slugs are
+    resolved for all items with one query by the view.
+    """
+    name = serializers.CharField(max_length=256)
+    slug = serializers.SlugField(max_length=50)
+
+
+class TitleBulkSerializer(serializers.Serializer):
+    """
+    Item of titles bulk request. Item with 'id' updates the title,
+    others create new ones. Relations are given by slugs which are
+    resolved for all items at once, so validation makes no queries.
+    """
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=200, required=False)
+    year = serializers.IntegerField(
+        required=False,
+        validators=[NotOverCurrentYearValidator]
+    )
+    description = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        allow_null=True
+    )
+    category = serializers.SlugField(required=False)
+    genre = serializers.ListField(
+        child=serializers.SlugField(),
+        required=False
+    )
+
+    def validate(self, data):
+        if 'id' not in data:
+            missing = {
+                field: [serializers.Field.default_error_messages['required']]
+                for field in ('name', 'year', 'category', 'genre')
+                if field not in data
+            }
+            if missing:
+                raise serializers.ValidationError(missing)
+        return data
+
+
 class ValueFromViewKeyword:
     """
     Custom class to get default value by the key in serializer`s 'view'
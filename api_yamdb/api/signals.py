@@ -0,0 +1,103 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save
+)
+
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title
+)
+from users.models import User
+from .authentication import user_cache
+from .cache import invalidate
+
+CATALOG_MODELS = (Category, Genre, Title, GenreTitle, Review)
+
+
+def invalidate_cache(**kwargs):
+    """
+    Invalidate after commit. Earlier a concurrent request could cache
+    data read before the commit under the new cache generation.
+    """
+    transaction.on_commit(invalidate)
+
+
+for model in CATALOG_MODELS:
+    post_save.connect(invalidate_cache, sender=model)
+    post_delete.connect(invalidate_cache, sender=model)
+m2m_changed.connect(invalidate_cache, sender=Title.genre.through)
+
+
+def touch_category_titles(instance, **kwargs):
+    """
+    Titles lose their category with SET_NULL update, no signals sent.
+    Runs in the transaction of the delete, cache is invalidated after.
+    """
+    Title.objects.filter(category=instance).touch()
+    transaction.on_commit(invalidate)
+
+
+def touch_genre_titles(instance, **kwargs):
+    Title.objects.filter(genre=instance).touch()
+    transaction.on_commit(invalidate)
+
+
+pre_delete.connect(touch_category_titles, sender=Category)
+pre_delete.connect(touch_genre_titles, sender=Genre)
+
+
+def remove_review_score(instance, **kwargs):
+    """
+    Remove score of a deleted review from the stored rating. Covers
+    reviews deleted by cascade with their author as well as by
+    ReviewViewSet.
+    """
+    Title.objects.filter(pk=instance.title_id).update_rating(
+        removed=instance.score
+    )
+
+
+post_delete.connect(remove_review_score, sender=Review)
+
+
+def touch_author_titles(instance, update_fields=None, **kwargs):
+    """
+    Reviews and comments show the username of the author, conditional
+    GET stamps of their titles have to change with it.
+    """
+    if instance.pk is None or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        return
+    username = User.objects.filter(pk=instance.pk).values_list(
+        'username', flat=True
+    ).first()
+    if username in (None, instance.username):
+        return
+    Title.objects.filter(
+        Q(pk__in=Review.objects.filter(author=instance).values('title'))
+        | Q(pk__in=Comment.objects.filter(author=instance).values(
+            'review__title'
+        ))
+    ).touch()
+
+
+pre_save.connect(touch_author_titles, sender=User)
+
+
+def forget_user(instance, **kwargs):
+    """Role or other user data changed, e.g. by UserViewSet or 'me'."""
+    user_cache.forget(instance.pk)
+
+
+post_save.connect(forget_user, sender=User)
+post_delete.connect(forget_user, sender=User)
@@ -0,0 +1,92 @@
+import logging
+import os
+import random
+import sys
+import time
+
+import django
+from django.conf import settings
+
+from . import metrics
+from .constants import SLOW_QUERY_MAX_SQL_LENGTH, SLOW_QUERY_STACK_DEPTH
+from .metrics import current_request, get_view_name
+
+logger = logging.getLogger('api.slow_queries')
+# Frames of these directories and wrapper modules are skipped looking
+# for the call site.
+SKIPPED_DIRS = (
+    os.path.dirname(django.__file__) + os.sep,
+    os.path.dirname(logging.__file__) + os.sep,
+)
+SKIPPED_FILES = (__file__, metrics.__file__)
+
+
+def short_path(filename):
+    """Path relative to the longest import path containing the file."""
+    roots = [
+        root for root in sys.path
+        if root and filename.startswith(os.path.join(root, ''))
+    ]
+    if not roots:
+        return filename
+    return os.path.relpath(filename, max(roots, key=len))
+
+
+def get_call_site():
+    """Innermost frames outside of Django and database wrappers."""
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < SLOW_QUERY_STACK_DEPTH:
+        filename = frame.f_code.co_filename
+        if (
+            filename not in SKIPPED_FILES
+            and not filename.startswith(SKIPPED_DIRS)
+        ):
+            frames.append(
+                f'{short_path(filename)}:'
+                f'{frame.f_lineno} in {frame.f_code.co_name}'
+            )
+        frame = frame.f_back
+    return ' <- '.join(frames)
+
+
+def log_slow_query(sql, params, many, duration):
+    request = current_request.get()
+    if many:
+        params = f'{len(params)} parameter sets'
+    if len(sql) > SLOW_QUERY_MAX_SQL_LENGTH:
+        sql = sql[:SLOW_QUERY_MAX_SQL_LENGTH] + '...'
+    logger.warning(
+        '%.1fms view=%s at %s\n%s\nparams: %s',
+        duration * 1000,
+        get_view_name(request) if request is not None else '-',
+        get_call_site(),
+        sql,
+        params
+    )
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """
+    Database execute wrapper logging queries slower than
+    SLOW_QUERY_THRESHOLD milliseconds, a SLOW_QUERY_SAMPLE_RATE share
+    of them is logged.
+    """
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        if (
+            duration * 1000 >= settings.SLOW_QUERY_THRESHOLD
+            and random.random() < settings.SLOW_QUERY_SAMPLE_RATE
+        ):
+            log_slow_query(sql, params, many, duration)
+
+
+def install_slow_query_wrapper(connection, **kwargs):
+    """connection_created receiver."""
+    if settings.SLOW_QUERY_THRESHOLD is None:
+        return
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
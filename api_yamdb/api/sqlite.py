@@ -0,0 +1,30 @@
+from django.conf import settings
+
+
+def begin_immediate(execute, sql, params, many, context):
+    """
+    Database execute wrapper taking the write lock at the start of
+    transaction. Deferred transaction which reads first fails with
+    'database is locked' at its first write if another connection has
+    written meanwhile, busy_timeout is not applied in that case.
+    """
+    if sql == 'BEGIN':
+        sql = 'BEGIN IMMEDIATE'
+    return execute(sql, params, many, context)
+
+
+def apply_pragmas(connection, **kwargs):
+    """
+    connection_created receiver. Apply SQLITE_PRAGMAS to new SQLite
+    connections and make transactions immediate if
+    SQLITE_BEGIN_IMMEDIATE is set. Pragmas run on the raw connection,
+    so database execute wrappers do not see these statements.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+    if begin_immediate in connection.execute_wrappers:
+        connection.execute_wrappers.remove(begin_immediate)
+    if settings.SQLITE_BEGIN_IMMEDIATE:
+        connection.execute_wrappers.append(begin_immediate)
@@ -1,12 +1,14 @@
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
 from django.contrib.auth.tokens import default_token_generator
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import exceptions
 from rest_framework import permissions
 from rest_framework import serializers
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
@@ -17,20 +19,46 @@ from rest_framework.viewsets import ModelViewSet, GenericViewSet
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Genre, Title, Review
-from users.models import User
-from .constants import EMAIL_FROM
-from .filters import TitleFilters
+from reviews.models import SCORE_FIELDS, Category, Genre, Title, Review
+from users.models import EmailOutbox, User
+from .authentication import user_cache
+from .bulk import bulk_save_slugged, bulk_save_titles, get_items
+from .cache import CachedListMixin, cached_response
+from .conditional import (
+    comment_stamp,
+    conditional,
+    review_stamp,
+    title_list_stamp,
+    title_stamp
+)
+from .constants import EMAIL_FROM, TOP_TITLES_LIMIT, TOP_TITLES_MAX_LIMIT
+from .export import export_titles
+from .filters import (
+    NormalizedSearchFilter,
+    TitleFilters,
+    TitleOrderingFilter
+)
+from .metrics import SerializerTimingMixin
+from .pagination import KeysetPagination
 from .permissions import (
     IsAdminOrReadOnly,
     IsAdminOrModerOrAuthorOrReadOnly,
     IsAdmin
 )
+from .row_serializers import (
+    CommentRowSerializer,
+    ReviewRowSerializer,
+    RowSerializerMixin,
+    TitleRowSerializer,
+    TopTitleRowSerializer
+)
 from .serializers import (
     CategorySerializer,
     GenreSerializer,
+    ScoreHistogramSerializer,
     TitleSerializer,
     TitleSerializerPostUpdate,
+    TopTitleSerializer,
     ReviewSerializer,
     CommentSerializer,
     UserSerializer,
@@ -50,6 +78,8 @@ def get_object(self, keyword, model):
 
 
 class BaseViewSet(
+    SerializerTimingMixin,
+    CachedListMixin,
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
@@ -58,8 +88,13 @@ class BaseViewSet(
     """ViewSet for inheriting. Pre-configured some stuff."""
     lookup_field = 'slug'
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (SearchFilter, )
-    search_fields = ('name',)
+    filter_backends = (NormalizedSearchFilter, )
+
+    @action(methods=['post'], detail=False, permission_classes=(IsAdmin,))
+    def bulk(self, request):
+        """Create objects or rename existing ones with the same slug."""
+        results = bulk_save_slugged(self.queryset.model, get_items(request))
+        return Response(results, status=status.HTTP_200_OK)
 
 
 class CategoryViewSet(BaseViewSet):
@@ -75,61 +110,210 @@ class GenreViewSet(BaseViewSet):
     queryset = Genre.objects.all()
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(
+    SerializerTimingMixin,
+    RowSerializerMixin,
+    CachedListMixin,
+    ModelViewSet
+):
     """ViewSet for Title model."""
     permission_classes = (IsAdminOrReadOnly,)
+    row_serializer_classes = {
+        'list': TitleRowSerializer,
+        'retrieve': TitleRowSerializer,
+        'top': TopTitleRowSerializer,
+    }
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitleFilters
 
     def get_serializer_class(self):
+        if self.action == 'top':
+            return TopTitleSerializer
         if self.action not in ('list', 'retrieve'):
             return TitleSerializerPostUpdate
 
         return TitleSerializer
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['score_histogram'] = self.request.query_params.get(
+            'score_histogram'
+        ) in ('1', 'true')
+        return context
+
     def get_queryset(self):
-        return Title.objects.annotate(rating=Avg('reviews__score'))
+        return Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre')
+
+    @conditional(title_list_stamp)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(methods=['get'], detail=False)
+    @conditional(title_list_stamp)
+    def top(self, request):
+        """
+        Titles with the best weighted rating, 'limit' of them. Filters
+        are the same as for the list. Titles without reviews are skipped.
+        """
+        try:
+            limit = serializers.IntegerField(
+                min_value=1,
+                max_value=TOP_TITLES_MAX_LIMIT
+            ).run_validation(
+                request.query_params.get('limit', TOP_TITLES_LIMIT)
+            )
+        except serializers.ValidationError as error:
+            raise serializers.ValidationError({'limit': error.detail})
+
+        def get_response():
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                weighted_rating__isnull=False
+            ).order_by('-weighted_rating', '-pk')
+            serializer = self.get_serializer(queryset[:limit], many=True)
+            return Response(serializer.data)
+
+        return cached_response(request, get_response)
+
+    @action(methods=['post'], detail=False, permission_classes=(IsAdmin,))
+    def bulk(self, request):
+        """Create titles or update the ones with 'id' in one transaction."""
+        results = bulk_save_titles(get_items(request))
+        return Response(results, status=status.HTTP_200_OK)
+
+    @action(methods=['get'], detail=False, permission_classes=(IsAdmin,))
+    def export(self, request):
+        """
+        Stream the whole catalog (or its filtered part) as newline
+        delimited JSON. '?reviews=1' adds reviews of every title.
+        """
+        with_reviews = request.query_params.get('reviews') in ('1', 'true')
+        return StreamingHttpResponse(
+            export_titles(
+                self.filter_queryset(Title.objects.all()),
+                with_reviews=with_reviews
+            ),
+            content_type='application/x-ndjson; charset=utf-8'
+        )
 
+    @conditional(title_stamp)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
-class ReviewViewSet(ModelViewSet):
+    @action(methods=['get'], detail=True, url_path='score_histogram')
+    @conditional(title_stamp)
+    def score_histogram(self, request, pk=None):
+        """Stored counters of review scores, nothing is aggregated."""
+        title = get_object_or_404(
+            Title.objects.only('rating_count', *SCORE_FIELDS), pk=pk
+        )
+        return Response(ScoreHistogramSerializer(title).data)
+
+
+class ReviewViewSet(SerializerTimingMixin, RowSerializerMixin, ModelViewSet):
     """ViewSet for Review model."""
     serializer_class = ReviewSerializer
+    row_serializer_classes = {
+        'list': ReviewRowSerializer,
+        'retrieve': ReviewRowSerializer,
+    }
     queryset = Review.objects.all()
     permission_classes = (IsAdminOrModerOrAuthorOrReadOnly, )
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         title = get_object(self, 'title_id', Title)
         return title.reviews.all()
 
+    @conditional(review_stamp)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional(review_stamp)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         title = get_object(self, 'title_id', Title)
-        serializer.save(
-            author=self.request.user,
-            title=title
-        )
+        with transaction.atomic():
+            review = serializer.save(
+                author=self.request.user,
+                title=title
+            )
+            Title.objects.filter(pk=title.pk).update_rating(
+                added=review.score
+            )
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            removed = Review.objects.select_for_update().values_list(
+                'score', flat=True
+            ).get(pk=serializer.instance.pk)
+            review = serializer.save()
+            Title.objects.filter(pk=review.title_id).update_rating(
+                added=review.score,
+                removed=removed
+            )
+
+    def perform_destroy(self, instance):
+        """
+        Rating is updated by the Review post_delete receiver. The row is
+        deleted by queryset in a transaction, so of concurrent deletes
+        only the one finding the row sends the signal.
+        """
+        with transaction.atomic():
+            Review.objects.filter(pk=instance.pk).delete()
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(SerializerTimingMixin, RowSerializerMixin, ModelViewSet):
     """ViewSet for Comment model."""
     serializer_class = CommentSerializer
+    row_serializer_classes = {
+        'list': CommentRowSerializer,
+        'retrieve': CommentRowSerializer,
+    }
     permission_classes = (IsAdminOrModerOrAuthorOrReadOnly, )
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         review = get_object(self, 'review_id', Review)
 
         return review.comments.all()
 
+    @conditional(comment_stamp)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional(comment_stamp)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         review = get_object(self, 'review_id', Review)
-        serializer.save(
-            author=self.request.user,
-            review=review
-        )
+        with transaction.atomic():
+            serializer.save(
+                author=self.request.user,
+                review=review
+            )
+            Title.objects.filter(pk=review.title_id).touch()
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            comment = serializer.save()
+            Title.objects.filter(reviews=comment.review_id).touch()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            Title.objects.filter(reviews=instance.review_id).touch()
 
 
 class UsersSignUp(APIView):
     """Allows users to get confirmation code to their email.
     If user with specified username and email doesn't exist,
-    the new account will be created.
+    the new account will be created. Email is queued to the outbox
+    and delivered by send_emails command.
     """
     permission_classes = (permissions.AllowAny,)
 
@@ -138,19 +322,24 @@ class UsersSignUp(APIView):
         serializer.is_valid(raise_exception=True)
         username = serializer.data.get('username')
         email = serializer.data.get('email')
-        user, created = User.objects.get_or_create(
-            username=username,
-            email=email
-        )
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(
-            'Ваш код для получения токена. ',
-            f'Здравствуйте, {username}! Ваш код для получения токена: '
-            f'{confirmation_code}',
-            EMAIL_FROM,
-            [email],
-            fail_silently=False
-        )
+        with transaction.atomic():
+            user, created = User.objects.get_or_create(
+                username=username,
+                email=email
+            )
+            confirmation_code = default_token_generator.make_token(user)
+            EmailOutbox.objects.update_or_create(
+                email=email,
+                status='pending',
+                defaults={
+                    'from_email': EMAIL_FROM,
+                    'subject': 'Ваш код для получения токена. ',
+                    'body': f'Здравствуйте, {username}! Ваш код для '
+                            f'получения токена: {confirmation_code}',
+                    'attempts': 0,
+                    'next_attempt': timezone.now(),
+                }
+            )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -174,26 +363,36 @@ class UsersTokenObtain(APIView):
         raise serializers.ValidationError({'confirmation_code': 'is invalid'})
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(SerializerTimingMixin, ModelViewSet):
     """Admin or superuser can manage users. The 'me' action allows users
     to get the information about himself or modify this information.
     """
     permission_classes = (IsAdmin,)
-    queryset = User.objects.all()
+    queryset = User.objects.order_by('username')
     serializer_class = UserSerializer
     lookup_field = 'username'
 
     @action(methods=['get', 'patch'], detail=False,
             permission_classes=(permissions.IsAuthenticated,))
     def me(self, request):
+        """
+        Reads come from the users cache. Changes are made to a fresh
+        row, a cached one may hold a stale role set by an admin since.
+        """
+        if request.method == 'PATCH':
+            user = User.objects.filter(pk=request.user.pk).first()
+        else:
+            user = user_cache.get(request.user.pk)
+        if user is None:
+            raise exceptions.NotAuthenticated()
         if request.method == 'PATCH':
             serializer = self.get_serializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(user)
         return Response(serializer.data)
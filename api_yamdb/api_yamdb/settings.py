@@ -25,6 +25,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
+    'api.db_routers.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,13 +58,48 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
+# Connections are kept for DB_CONN_MAX_AGE seconds (0 closes them after
+# every request), SQLITE_PRAGMAS are applied to each new one.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
     }
 }
 
+# WAL journal lets readers work while a writer commits, NORMAL
+# synchronous is safe with WAL. Writers wait busy_timeout ms for a lock
+# instead of failing with 'database is locked'. Negative cache_size is
+# in KiB.
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024)),
+}
+# Transactions take the write lock at BEGIN, so concurrent writers wait
+# for busy_timeout instead of failing when they switch from reading to
+# writing.
+SQLITE_BEGIN_IMMEDIATE = os.getenv('SQLITE_BEGIN_IMMEDIATE', '1') == '1'
+
+# Read replicas: comma separated SQLite files in DB_REPLICAS, kept in
+# sync by external replication. Safe requests to API viewsets read from
+# a random replica, clients that have written (signed cookie) read from
+# primary for REPLICA_PIN_SECONDS. Tests use primary database for every
+# replica.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1
+):
+    DATABASE_REPLICAS.append(f'replica{number}')
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'], 'NAME': name, 'TEST': {'MIRROR': 'default'}
+    }
+DATABASE_ROUTERS = ['api.db_routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -102,13 +139,34 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
 }
 
+# Cache settings. Public list endpoints responses are cached in 'api' cache.
+# Set API_CACHE_BACKEND environment variable to 'file' to share the cache
+# between processes of one host.
+API_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'api_cache'),
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': API_CACHE_BACKENDS[os.getenv('API_CACHE_BACKEND', 'locmem')],
+}
+API_CACHE_TIMEOUT = 300
+
 # Email settings. For test purposes saves to file in sent_emails dir.
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
@@ -118,3 +176,42 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
+
+# Slow query log. Queries slower than SLOW_QUERY_THRESHOLD milliseconds
+# are written with SLOW_QUERY_SAMPLE_RATE probability to a rotating file
+# by a background thread. Empty, 'off' or 'none' value (None here) turns
+# the log off.
+SLOW_QUERY_THRESHOLD = os.getenv('SLOW_QUERY_THRESHOLD', '100')
+SLOW_QUERY_THRESHOLD = (
+    None if SLOW_QUERY_THRESHOLD.strip().lower() in ('', 'off', 'none')
+    else float(SLOW_QUERY_THRESHOLD)
+)
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE', 1))
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'slow_queries': {
+            'format': '%(asctime)s %(process)d %(message)s',
+        },
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'api.logs.QueueFileHandler',
+            'filename': os.getenv(
+                'SLOW_QUERY_LOG',
+                os.path.join(BASE_DIR, 'logs', 'slow_queries.log')
+            ),
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'formatter': 'slow_queries',
+        },
+    },
+    'loggers': {
+        'api.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
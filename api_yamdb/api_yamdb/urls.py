@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import TemplateView
 
+from api.metrics import MetricsView
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -10,5 +12,6 @@ urlpatterns = [
         TemplateView.as_view(template_name='redoc.html'),
         name='redoc'
     ),
-    path('api/', include('api.urls'), name='api')
+    path('api/', include('api.urls'), name='api'),
+    path('metrics/', MetricsView.as_view(), name='metrics')
 ]
@@ -1,3 +1,7 @@
 MIN_SCORE_VALUE = 1
 MAX_SCORE_VALUE = 10
 STR_FUNC_SYMBOL_COUNT = 20
+# Weighted rating prior: every title starts as if it had this many
+# reviews with the neutral score.
+PRIOR_SCORE = (MIN_SCORE_VALUE + MAX_SCORE_VALUE) / 2
+PRIOR_WEIGHT = 10
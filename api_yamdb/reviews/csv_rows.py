@@ -0,0 +1,45 @@
+"""
+Parsing of csv data files for import_csv command. Runs in worker
+processes and does not depend on Django: with the spawn start method
+workers import it without configured settings.
+"""
+import csv
+import gzip
+from itertools import islice
+
+
+def open_data_file(path, mode):
+    """Files with .gz suffix are compressed with gzip."""
+    opener = gzip.open if path.endswith('.gz') else open
+    return opener(path, mode, encoding='utf8', newline='')
+
+
+def read_chunks(path, size):
+    """Yield lists of at most size rows ready for model init."""
+    with open_data_file(path, 'rt') as csv_file:
+        rows = csv.DictReader(csv_file)
+        while True:
+            chunk = list(islice(rows, size))
+            if not chunk:
+                return
+            for row in chunk:
+                if 'category' in row:
+                    row['category_id'] = row.pop('category') or None
+                if 'author' in row:
+                    row['author_id'] = row.pop('author')
+            yield chunk
+
+
+def parse_file(path, size, queue):
+    """
+    Put chunks of the file to the queue and None after the last one.
+    Bounded queue keeps the worker no more than a few chunks ahead of
+    the loader. A parsing error is put to the queue instead of a chunk.
+    """
+    try:
+        for chunk in read_chunks(path, size):
+            queue.put(chunk)
+    except Exception as error:
+        queue.put(error)
+        return
+    queue.put(None)
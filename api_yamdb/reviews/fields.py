@@ -0,0 +1,27 @@
+from django.db import models
+
+from .search import normalize
+
+
+class NormalizedField(models.CharField):
+    """
+    Indexed normalized copy of the source field for case-insensitive
+    search, see reviews.search.normalize. Filled on save and bulk_create.
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('db_index', True)
+        kwargs.setdefault('default', '')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = normalize(getattr(model_instance, self.source) or '')
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,41 @@
+"""
+Random Cyrillic text for synthetic data. Does not depend on Django,
+so benchmark scripts import it before settings are configured.
+"""
+import itertools
+
+SYLLABLES = (
+    'ба', 'ве', 'го', 'да', 'жи', 'зо', 'ки', 'ла', 'ми', 'но', 'пе', 'ро',
+    'су', 'ти', 'фа', 'хо', 'це', 'чу', 'ша', 'ще', 'ён', 'юр', 'ям', 'ост',
+)
+# Zipf distributed vocabulary: few words are frequent, most are rare.
+VOCABULARY = [
+    ''.join(syllables)
+    for length in (2, 3)
+    for syllables in itertools.product(SYLLABLES, repeat=length)
+][:20000]
+
+
+def zipf_weights(count, skew=1.0):
+    """Cumulative weights for rng.choices: first items are the most common."""
+    return list(itertools.accumulate(
+        1 / rank ** skew for rank in range(1, count + 1)
+    ))
+
+
+WEIGHTS = zipf_weights(len(VOCABULARY))
+
+
+def words(rng, count):
+    return ' '.join(rng.choices(VOCABULARY, cum_weights=WEIGHTS, k=count))
+
+
+def text(rng, min_words, max_words):
+    """Sentences of 4 to 15 words with capital letters and full stops."""
+    left = rng.randint(min_words, max_words)
+    sentences = []
+    while left > 0:
+        count = min(rng.randint(4, 15), left)
+        sentences.append(words(rng, count).capitalize() + '.')
+        left -= count
+    return ' '.join(sentences)
@@ -0,0 +1,113 @@
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.csv_rows import open_data_file
+from .import_csv import ALLOWED_FILENAMES, DATA_FILES_DIR
+
+COLUMNS = {
+    'category': ('id', 'name', 'slug'),
+    'genre': ('id', 'name', 'slug'),
+    'titles': ('id', 'name', 'year', 'category', 'description'),
+    'genre_title': ('id', 'title_id', 'genre_id'),
+    'users': (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    ),
+    'review': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+CHUNK_SIZE = 2000
+
+
+def format_value(value):
+    """Dates are written the way static/data files store them."""
+    if isinstance(value, datetime):
+        return value.isoformat().replace('+00:00', 'Z')
+    return value
+
+
+class Command(BaseCommand):
+    """Command class. See help attribute for further info."""
+    help = '''Write tables into .csv files in the layout import_csv
+        reads: category, genre, titles, genre_title, users, review
+        and comments. Rows are streamed from a database cursor, so memory
+        use does not depend on table size. With --jobs several files
+        are written at the same time, one file per worker.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=DATA_FILES_DIR,
+            help='Directory to write .csv files to.'
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Compress files with gzip (.csv.gz).'
+        )
+        parser.add_argument(
+            '--overwrite',
+            action='store_true',
+            help='Replace files that already exist.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='How many rows to fetch from the cursor at once.'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=1,
+            help='How many files to write at the same time.'
+        )
+
+    def _export(self, name, path, options):
+        """Write one table. Runs in a thread with its own connection."""
+        columns = COLUMNS[name]
+        rows = ALLOWED_FILENAMES[name].objects.order_by('pk').values_list(
+            *columns
+        ).iterator(chunk_size=options['chunk_size'])
+        started = time.monotonic()
+        count = 0
+        try:
+            with open_data_file(path, 'wt') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow([format_value(value) for value in row])
+                    count += 1
+        finally:
+            connection.close()
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f'{os.path.basename(path)}: {count} rows in {elapsed:.2f}s '
+            f'({count / max(elapsed, 1e-6):.0f} rows/sec)'
+        )
+
+    def handle(self, *args, **options):
+        suffix = '.csv.gz' if options['gzip'] else '.csv'
+        os.makedirs(options['data_dir'], exist_ok=True)
+        files = {
+            name: os.path.join(options['data_dir'], name + suffix)
+            for name in COLUMNS
+        }
+        existing = [path for path in files.values() if os.path.exists(path)]
+        if existing and not options['overwrite']:
+            raise CommandError(
+                f'{", ".join(existing)} already exist. '
+                'Use --overwrite to replace them.'
+            )
+        with ThreadPoolExecutor(max_workers=max(options['jobs'], 1)) as pool:
+            futures = [
+                pool.submit(self._export, name, path, options)
+                for name, path in files.items()
+            ]
+            for future in futures:
+                future.result()
@@ -0,0 +1,320 @@
+import random
+import time
+from collections import defaultdict
+from datetime import timedelta
+from itertools import chain
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from reviews.constants import (
+    MAX_SCORE_VALUE,
+    MIN_SCORE_VALUE,
+    PRIOR_SCORE,
+    PRIOR_WEIGHT
+)
+from reviews.fields import NormalizedField
+from reviews.generators import text, words
+from reviews.models import (
+    SCORE_FIELDS,
+    SCORES,
+    Category,
+    Comment,
+    Genre,
+    GenreTitle,
+    Review,
+    Title,
+    User
+)
+from reviews.search import normalize
+
+BATCH_SIZE = 10000
+# Generating text for every row would take most of the time,
+# rows take random texts from a pool of this size instead.
+TEXT_POOL_SIZE = 5000
+MODERATOR_SHARE = 0.01
+DATES_SPAN = timedelta(days=3 * 365)
+FIELDS = {
+    User: ('id', 'username', 'email', 'password', 'role', 'bio'),
+    Category: ('id', 'name', 'slug'),
+    Genre: ('id', 'name', 'slug'),
+    Title: (
+        'id', 'name', 'year', 'category_id', 'description',
+        'rating_sum', 'rating_count', 'rating', 'weighted_rating',
+        *SCORE_FIELDS
+    ),
+    GenreTitle: ('title_id', 'genre_id'),
+    Review: ('id', 'title_id', 'author_id', 'score', 'text', 'pub_date'),
+    Comment: ('review_id', 'author_id', 'text', 'pub_date'),
+}
+
+
+class Inserter:
+    """
+    Insert tuples of FIELDS values into model table with executemany.
+    Other columns get defaults (auto_now dates get current time),
+    normalized fields are calculated from their source values.
+    """
+
+    def __init__(self, model, now):
+        fields = FIELDS[model]
+        normalized = [
+            field for field in model._meta.concrete_fields
+            if isinstance(field, NormalizedField)
+        ]
+        rest = [
+            field for field in model._meta.concrete_fields
+            if field.attname not in fields and field not in normalized
+        ]
+        self.sources = [fields.index(field.source) for field in normalized]
+        self.constants = tuple(
+            field.get_db_prep_save(
+                now if getattr(field, 'auto_now', False)
+                or getattr(field, 'auto_now_add', False)
+                else field.get_default(),
+                connection
+            )
+            for field in rest
+        )
+        columns = [model._meta.get_field(name).column for name in fields]
+        columns += [field.column for field in normalized + rest]
+        quote = connection.ops.quote_name
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(column) for column in columns),
+            ', '.join(['%s'] * len(columns))
+        )
+
+    def __call__(self, cursor, rows):
+        sources, constants = self.sources, self.constants
+        cursor.executemany(self.sql, [
+            row + tuple(normalize(row[index]) for index in sources)
+            + constants
+            for row in rows
+        ])
+
+
+class Command(BaseCommand):
+    """Command class. See help attribute for further info."""
+    help = '''Fill the database with synthetic users, categories, genres,
+        titles with genres, reviews and comments in Russian. Reviews
+        follow Zipf distribution: a few hot titles get most of them,
+        comments go mostly to reviews of hot titles. Rows are added to
+        existing ones in one transaction, the same --seed gives the same
+        data.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--reviews', type=int, default=10000)
+        parser.add_argument(
+            '--comments',
+            type=int,
+            help='Number of comments, same as reviews by default.'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.0,
+            help='Zipf exponent of reviews per title, 0 spreads evenly.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='How many rows to insert with one query.'
+        )
+
+    def _insert(self, rows):
+        """
+        Insert (model, values) pairs by batches of every model, report
+        speed. Foreign keys are checked at commit, so rows referencing
+        objects from a pending batch can be inserted first.
+        """
+        started = time.monotonic()
+        inserters = {}
+        batches, counts = defaultdict(list), defaultdict(int)
+
+        def flush(model, batch):
+            if model not in inserters:
+                inserters[model] = Inserter(model, self.now)
+            inserters[model](cursor, batch)
+            counts[model] += len(batch)
+            batch.clear()
+
+        with connection.cursor() as cursor:
+            for model, values in rows:
+                batch = batches[model]
+                batch.append(values)
+                if len(batch) == self.batch_size:
+                    flush(model, batch)
+            for model, batch in batches.items():
+                flush(model, batch)
+        elapsed = time.monotonic() - started
+        for model, count in counts.items():
+            self.stdout.write(f'{model._meta.model_name}: {count} rows')
+        total = sum(counts.values())
+        self.stdout.write(
+            f'{total} rows in {elapsed:.2f}s '
+            f'({total / max(elapsed, 1e-6):.0f} rows/sec)'
+        )
+
+    def _first_id(self, model):
+        """Rows get explicit ids, so reviews can refer to their titles."""
+        return (model.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+
+    def _dates(self, count):
+        """Random dates within DATES_SPAN ready for the database."""
+        adapt = connection.ops.adapt_datetimefield_value
+        now, rng = self.now, self.rng
+        return [adapt(now - rng.random() * DATES_SPAN) for _ in range(count)]
+
+    def _review_counts(self, titles, reviews, users, skew):
+        """Split reviews between titles, at most one per user for a title."""
+        weights = [1 / rank ** skew for rank in range(1, titles + 1)]
+        total = sum(weights)
+        counts = [min(users, int(reviews * weight / total))
+                  for weight in weights]
+        left = reviews - sum(counts)
+        while left:
+            free = [index for index, count in enumerate(counts)
+                    if count < users]
+            if not free:
+                raise CommandError(
+                    f'{reviews} reviews do not fit into {titles} titles '
+                    f'with {users} users: one review per user for a title.'
+                )
+            for index in free[:left]:
+                counts[index] += 1
+            left -= min(left, len(free))
+        return counts
+
+    def _users(self, count):
+        rng = self.rng
+        first = self._first_id(User)
+        for pk in range(first, first + count):
+            role = 'moderator' if rng.random() < MODERATOR_SHARE else 'user'
+            yield User, (
+                pk,
+                f'user{pk}',
+                f'user{pk}@yamdb.fake',
+                '!',
+                role,
+                rng.choice(self.bios)
+            )
+
+    def _slugged(self, model, count, prefix):
+        first = self._first_id(model)
+        for pk in range(first, first + count):
+            name = words(self.rng, self.rng.randint(1, 2)).capitalize()
+            yield model, (pk, name, f'{prefix}-{pk}')
+
+    def _titles(self, counts):
+        """Titles with genres and reviews, stored rating is precalculated."""
+        rng = self.rng
+        first = self._first_id(Title)
+        review_id = self._first_id(Review)
+        keys = set(Title.objects.values_list('name', 'year', 'category_id'))
+        for pk, count in enumerate(counts, first):
+            name = base = words(rng, rng.randint(1, 4)).capitalize()
+            year = rng.randint(1900, self.now.year)
+            category_id = rng.choice(self.category_ids)
+            sequel = 1
+            while (name, year, category_id) in keys:
+                sequel += 1
+                name = f'{base} {sequel}'
+            keys.add((name, year, category_id))
+
+            mean = rng.gauss(7, 1.5)
+            scores = [
+                min(max(round(rng.gauss(mean, 2)), MIN_SCORE_VALUE),
+                    MAX_SCORE_VALUE)
+                for _ in range(count)
+            ]
+            yield Title, (
+                pk,
+                name,
+                year,
+                category_id,
+                rng.choice(self.texts),
+                sum(scores),
+                count,
+                sum(scores) / count if count else None,
+                (sum(scores) + PRIOR_SCORE * PRIOR_WEIGHT)
+                / (count + PRIOR_WEIGHT) if count else None,
+                *(scores.count(score) for score in SCORES)
+            )
+            for genre_id in rng.sample(
+                self.genre_ids, rng.randint(1, min(3, len(self.genre_ids)))
+            ):
+                yield GenreTitle, (pk, genre_id)
+            authors = rng.sample(self.author_ids, count)
+            texts = rng.choices(self.texts, k=count)
+            dates = self._dates(count)
+            for values in zip(authors, scores, texts, dates):
+                yield Review, (review_id, pk, *values)
+                review_id += 1
+
+    def _comments(self, count, first_review, reviews):
+        """Reviews of hot titles have the smallest ids and most comments."""
+        rng = self.rng
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            # Sorted ids make inserts into review indexes sequential.
+            review_ids = sorted(
+                first_review + int(reviews * rng.random() ** 3)
+                for _ in range(size)
+            )
+            authors = rng.choices(self.author_ids, k=size)
+            texts = rng.choices(self.comments, k=size)
+            for values in zip(review_ids, authors, texts, self._dates(size)):
+                yield Comment, values
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = max(options['batch_size'], 1)
+        self.now = timezone.now()
+        self.texts = [
+            text(self.rng, 10, 120) for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.comments = [
+            text(self.rng, 3, 40) for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.bios = [''] + self.comments[:100]
+        comments = options['comments']
+        if comments is None:
+            comments = options['reviews']
+        if comments and not options['reviews']:
+            raise CommandError('Comments need reviews.')
+
+        with transaction.atomic():
+            self._insert(chain(
+                self._users(options['users']),
+                self._slugged(Category, options['categories'], 'category'),
+                self._slugged(Genre, options['genres'], 'genre'),
+            ))
+            self.author_ids = list(User.objects.values_list('pk', flat=True))
+            self.category_ids = list(
+                Category.objects.values_list('pk', flat=True)
+            )
+            self.genre_ids = list(Genre.objects.values_list('pk', flat=True))
+            if options['titles'] and not (
+                self.category_ids and self.genre_ids
+            ):
+                raise CommandError('Titles need categories and genres.')
+            counts = self._review_counts(
+                options['titles'],
+                options['reviews'],
+                len(self.author_ids),
+                options['skew']
+            )
+            first_review = self._first_id(Review)
+            self._insert(chain(
+                self._titles(counts),
+                self._comments(comments, first_review, options['reviews'])
+            ))
@@ -1,9 +1,21 @@
-import csv
 import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait
+)
+from contextlib import contextmanager, nullcontext, suppress
+from itertools import chain
+from multiprocessing import Manager
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, transaction
 
 from api_yamdb.settings import BASE_DIR
+from reviews.csv_rows import parse_file
 from reviews.models import (
     Category,
     Genre,
@@ -25,21 +37,71 @@ ALLOWED_FILENAMES = {
     'users': User,
     'genre_title': GenreTitle,
 }
+DEPENDENCIES = {
+    'category': (),
+    'genre': (),
+    'users': (),
+    'titles': ('category',),
+    'genre_title': ('genre', 'titles'),
+    'review': ('titles', 'users'),
+    'comments': ('review', 'users'),
+}
+BATCH_SIZE = 1000
+# Parsed chunks waiting for the loader, per file.
+QUEUE_CHUNKS = 4
+
+
+def in_dependency_order(names):
+    """Files after the ones they depend on."""
+    ordered = []
+    while len(ordered) < len(names):
+        for name in names:
+            if name not in ordered and all(
+                dependency in ordered or dependency not in names
+                for dependency in DEPENDENCIES[name]
+            ):
+                ordered.append(name)
+    return ordered
 
 
-def sort_list(some_list: list):
+def receive(queue):
+    """Yield chunks put by parse_file, raise its parsing error."""
+    while True:
+        chunk = queue.get()
+        if chunk is None:
+            return
+        if isinstance(chunk, Exception):
+            raise chunk
+        yield chunk
+
+
+def drain(chunks):
     """
-    Custom ordering for files.
-    Should be done since some files depends on another.
+    Consume chunks left after a failed load, so their parser is not
+    stuck on a full queue and the pool can shut down.
     """
-    if 'users.csv' in some_list:
-        some_list.insert(0, some_list.pop(some_list.index('users.csv')))
-    if 'comments.csv' in some_list:
-        some_list.insert(6, some_list.pop(some_list.index('comments.csv')))
-    if 'titles.csv' in some_list:
-        some_list.insert(3, some_list.pop(some_list.index('titles.csv')))
+    with suppress(Exception):
+        for _ in chunks:
+            pass
+
 
-    return some_list
+@contextmanager
+def keep_dates(model, columns):
+    """
+    auto_now_add fields overwrite values on insert. Turn it off for
+    the columns present in the file, so pub_date survives the import.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) and field.name in columns
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
 
 
 class Command(BaseCommand):
@@ -52,30 +114,152 @@ class Command(BaseCommand):
         review.csv
         titles.csv
         users.csv
-        genre_title.csv'''
-
-    def _correct_files(self):
-        """Only .csv files allowed to proceed."""
-        files = os.listdir(DATA_FILES_DIR)
-        for file in os.listdir(DATA_FILES_DIR):
-            if not file.endswith('.csv'):
-                files.remove(file)
-
-        return sort_list(files)
-
-    def _populate_table(self, file, model):
-        """Create table entries row by row."""
-        path = os.path.join(DATA_FILES_DIR, file)
-        with open(path, 'r', encoding='utf8') as csv_file:
-            for row in csv.DictReader(csv_file):
-                if 'category' in row:
-                    row['category_id'] = row.pop('category')
-                if 'author' in row:
-                    row['author_id'] = row.pop('author')
-                model.objects.get_or_create(**row)
+        genre_title.csv
+        Files compressed with gzip (.csv.gz) are read as well.
+        Files are parsed in parallel processes and streamed to the
+        loader in chunks. Each file is loaded in one transaction with
+        bulk inserts as soon as files it depends on are loaded. Stored
+        rating of titles is recalculated afterwards.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            default=DATA_FILES_DIR,
+            help='Directory to read .csv files from.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='How many rows to insert with one query.'
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Skip rows violating unique constraints (e.g. existing).'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Load every file and roll the transaction back.'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=os.cpu_count(),
+            help='How many files to parse and load at the same time.'
+        )
+
+    def _correct_files(self, data_dir):
+        """Only allowed .csv files proceed. Return paths by names."""
+        files = {}
+        for file in sorted(os.listdir(data_dir)):
+            for suffix in ('.csv', '.csv.gz'):
+                name = file[:-len(suffix)]
+                if file.endswith(suffix) and name in ALLOWED_FILENAMES:
+                    files.setdefault(name, os.path.join(data_dir, file))
+        return files
+
+    def _populate_table(self, model, chunks, columns, options):
+        """
+        Insert chunks of rows with bulk_create batches inside one
+        transaction. Return number of rows.
+        """
+        batch_size = options['batch_size']
+        count = 0
+        with keep_dates(model, columns), transaction.atomic():
+            for rows in chunks:
+                model.objects.bulk_create(
+                    [model(**row) for row in rows],
+                    batch_size=batch_size,
+                    ignore_conflicts=options['ignore_conflicts']
+                )
+                count += len(rows)
+            if options['dry_run']:
+                transaction.set_rollback(True)
+        return count
+
+    def _load(self, name, queue, options):
+        """Load parsed file. Runs in a thread with its own connection."""
+        chunks = receive(queue)
+        try:
+            # Wait for the parser before taking the write lock, so the
+            # lock holder is never stuck behind a parser without worker.
+            first = next(chunks, [])
+            with self.write_lock:
+                started = time.monotonic()
+                count = self._populate_table(
+                    ALLOWED_FILENAMES[name],
+                    chain([first], chunks),
+                    first[0] if first else (),
+                    options
+                )
+                elapsed = time.monotonic() - started
+        except IntegrityError as error:
+            raise CommandError(
+                f'{name}.csv: {error}. Use --ignore-conflicts '
+                'to skip already existing rows.'
+            )
+        finally:
+            drain(chunks)
+            connection.close()
+        self.stdout.write(
+            f'{name}.csv: {count} rows in {elapsed:.2f}s '
+            f'({count / max(elapsed, 1e-6):.0f} rows/sec)'
+        )
+
+    def _load_in_order(self, names, queues, loaders, options):
+        """Load every file as soon as files it depends on are loaded."""
+        loading, loaded = {}, set()
+        try:
+            while len(loaded) < len(names):
+                for name in names:
+                    ready = all(
+                        dependency in loaded or dependency not in names
+                        for dependency in DEPENDENCIES[name]
+                    )
+                    if ready and name not in loading:
+                        loading[name] = loaders.submit(
+                            self._load, name, queues[name], options
+                        )
+                finished, _ = wait(
+                    [loading[name] for name in loading if name not in loaded],
+                    return_when=FIRST_COMPLETED
+                )
+                for name, future in loading.items():
+                    if future in finished:
+                        future.result()
+                        loaded.add(name)
+        except Exception:
+            # Files depending on a failed one are never loaded, their
+            # parsers would be stuck on full queues.
+            for name in queues:
+                if name not in loading:
+                    drain(receive(queues[name]))
+            raise
 
     def handle(self, *args, **options):
-        for file in self._correct_files():
-            name = file.split('.')[0]
-            if name in ALLOWED_FILENAMES:
-                self._populate_table(file, ALLOWED_FILENAMES[name])
+        files = self._correct_files(options['data_dir'])
+        names = list(files)
+        jobs = max(options['jobs'], 1)
+        # SQLite has a single writer, concurrent transactions would only
+        # fail with "database is locked". Parsing still runs in parallel.
+        self.write_lock = (
+            threading.Lock() if connection.vendor == 'sqlite'
+            else nullcontext()
+        )
+        # Parsers start in dependency order: a parser waiting for its
+        # loader only holds a worker after the files it depends on.
+        with Manager() as manager, \
+                ProcessPoolExecutor(max_workers=jobs) as parsers, \
+                ThreadPoolExecutor(max_workers=len(names) or 1) as loaders:
+            queues = {}
+            for name in in_dependency_order(names):
+                queues[name] = manager.Queue(maxsize=QUEUE_CHUNKS)
+                parsers.submit(
+                    parse_file, files[name], options['batch_size'],
+                    queues[name]
+                )
+            self._load_in_order(names, queues, loaders, options)
+        if not options['dry_run']:
+            Title.objects.recalculate_rating()
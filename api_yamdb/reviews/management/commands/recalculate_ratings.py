@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    """Command class. See help attribute for further info."""
+    help = '''Recalculate denormalized rating of every title from reviews
+        table. Use it after bulk loading reviews or if stored values
+        went out of sync (e.g. reviews deleted with their author).'''
+
+    def handle(self, *args, **options):
+        updated = Title.objects.recalculate_rating()
+        self.stdout.write(f'Rating recalculated for {updated} titles.')
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:54
+
+from django.db import migrations
+
+from reviews.search import create_search_index, drop_search_index
+
+
+def create_index(apps, schema_editor):
+    create_search_index(schema_editor.connection, rebuild=True)
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
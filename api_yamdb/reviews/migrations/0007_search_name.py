@@ -0,0 +1,40 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:57
+
+from django.db import migrations
+import reviews.fields
+from reviews.search import normalize
+
+
+def backfill_search_name(apps, schema_editor):
+    for model_name in ('Category', 'Genre', 'Title'):
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('name'))
+        for obj in objects:
+            obj.search_name = normalize(obj.name)
+        model.objects.bulk_update(objects, ['search_name'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='search_name',
+            field=reviews.fields.NormalizedField(db_index=True, default='', editable=False, max_length=256, source='name'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='search_name',
+            field=reviews.fields.NormalizedField(db_index=True, default='', editable=False, max_length=256, source='name'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='search_name',
+            field=reviews.fields.NormalizedField(db_index=True, default='', editable=False, max_length=200, source='name'),
+        ),
+        migrations.RunPython(backfill_search_name, migrations.RunPython.noop),
+    ]
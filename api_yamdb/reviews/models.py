@@ -3,14 +3,43 @@ from datetime import datetime
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 
 from .constants import (
     MAX_SCORE_VALUE,
     MIN_SCORE_VALUE,
+    PRIOR_SCORE,
+    PRIOR_WEIGHT,
     STR_FUNC_SYMBOL_COUNT
 )
+from .fields import NormalizedField
 
 User = get_user_model()
+SCORES = range(MIN_SCORE_VALUE, MAX_SCORE_VALUE + 1)
+# Title fields counting reviews with every score.
+SCORE_FIELDS = tuple(f'score_{score}' for score in SCORES)
+# Maintained by TitleQuerySet updates, never written by Title.save.
+DENORMALIZED_FIELDS = (
+    'rating_sum',
+    'rating_count',
+    'rating',
+    'weighted_rating',
+    'version',
+) + SCORE_FIELDS
 
 
 def NotOverCurrentYearValidator(value):
@@ -22,9 +51,13 @@ class Category(models.Model):
     """Model for categories."""
     name = models.CharField('Название категории', max_length=256)
     slug = models.SlugField(unique=True, max_length=50)
+    search_name = NormalizedField(max_length=256, source='name')
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name',), name='category_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -34,17 +67,123 @@ class Genre(models.Model):
     """Model for genres."""
     name = models.CharField('Название жанра', max_length=256)
     slug = models.SlugField(unique=True, max_length=50)
+    search_name = NormalizedField(max_length=256, source='name')
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=('name',), name='genre_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+def weighted_rating(rating_sum, rating_count):
+    """
+    Bayesian average of scores: PRIOR_WEIGHT reviews with PRIOR_SCORE
+    are added, so titles with few reviews stay close to the neutral score.
+    """
+    return (
+        Cast(rating_sum, FloatField()) + PRIOR_SCORE * PRIOR_WEIGHT
+    ) / (rating_count + PRIOR_WEIGHT)
+
+
+class TitleQuerySet(models.QuerySet):
+    """
+    QuerySet for Title model. Keeps denormalized rating and version stamp
+    (used for conditional GET of title, its reviews and comments) up to date.
+    """
+
+    def touch(self):
+        """Mark titles changed, e.g. when reviews or comments changed."""
+        return self.update(
+            version=F('version') + 1,
+            modified=timezone.now()
+        )
+
+    def update_rating(self, added=None, removed=None):
+        """
+        Atomically apply review score change to the stored rating.
+        Pass `added` for a new score, `removed` for a deleted one
+        and both of them for a changed score.
+        """
+        count_delta = (added is not None) - (removed is not None)
+        rating_sum = F('rating_sum') + (added or 0) - (removed or 0)
+        rating_count = F('rating_count') + count_delta
+        histogram = {}
+        if added != removed:
+            if added is not None:
+                histogram[f'score_{added}'] = F(f'score_{added}') + 1
+            if removed is not None:
+                histogram[f'score_{removed}'] = F(f'score_{removed}') - 1
+        return self.update(
+            version=F('version') + 1,
+            modified=timezone.now(),
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            **histogram,
+            rating=Case(
+                When(
+                    rating_count__gt=-count_delta,
+                    then=Cast(rating_sum, FloatField()) / rating_count
+                ),
+                default=Value(None),
+                output_field=FloatField()
+            ),
+            weighted_rating=Case(
+                When(
+                    rating_count__gt=-count_delta,
+                    then=weighted_rating(rating_sum, rating_count)
+                ),
+                default=Value(None),
+                output_field=FloatField()
+            )
+        )
+
+    def recalculate_rating(self):
+        """Recalculate stored rating from scratch using reviews table."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+
+        def aggregate(function):
+            return Subquery(
+                reviews.annotate(value=function).values('value')
+            )
+
+        updated = self.update(
+            version=F('version') + 1,
+            modified=timezone.now(),
+            rating_sum=Coalesce(aggregate(Sum('score')), 0),
+            rating_count=Coalesce(aggregate(Count('pk')), 0),
+            rating=aggregate(Avg('score')),
+            **{
+                f'score_{score}': Coalesce(
+                    aggregate(Count('pk', filter=Q(score=score))), 0
+                )
+                for score in SCORES
+            }
+        )
+        self.update(weighted_rating=Case(
+            When(
+                rating_count__gt=0,
+                then=weighted_rating(F('rating_sum'), F('rating_count'))
+            ),
+            default=Value(None),
+            output_field=FloatField()
+        ))
+        return updated
+
+
 class Title(models.Model):
-    """Model for titles."""
+    """
+    Model for titles. Rating fields and score_N counters of reviews with
+    every score are maintained by ReviewViewSet and the Review
+    post_delete receiver, see api.signals.
+    """
     name = models.CharField('Название', max_length=200)
+    search_name = NormalizedField(max_length=200, source='name')
     year = models.IntegerField(
         'Год выпуска',
         validators=[
@@ -65,9 +204,61 @@ class Title(models.Model):
         related_name='titles',
         blank=True
     )
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    rating_count = models.PositiveIntegerField('Количество оценок', default=0)
+    rating = models.FloatField('Рейтинг', blank=True, null=True)
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг',
+        blank=True,
+        null=True
+    )
+    score_1 = models.PositiveIntegerField('Оценок 1', default=0)
+    score_2 = models.PositiveIntegerField('Оценок 2', default=0)
+    score_3 = models.PositiveIntegerField('Оценок 3', default=0)
+    score_4 = models.PositiveIntegerField('Оценок 4', default=0)
+    score_5 = models.PositiveIntegerField('Оценок 5', default=0)
+    score_6 = models.PositiveIntegerField('Оценок 6', default=0)
+    score_7 = models.PositiveIntegerField('Оценок 7', default=0)
+    score_8 = models.PositiveIntegerField('Оценок 8', default=0)
+    score_9 = models.PositiveIntegerField('Оценок 9', default=0)
+    score_10 = models.PositiveIntegerField('Оценок 10', default=0)
+    version = models.PositiveIntegerField('Версия', default=0)
+    modified = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ('name',)
+        # Unique constraint index serves ordering by name. The others
+        # serve ordering by year or rating and filtering by year or
+        # category ordered by name or weighted rating.
+        indexes = [
+            models.Index(
+                fields=('year', 'name'),
+                name='title_year_name_idx'
+            ),
+            models.Index(
+                fields=('category', 'name'),
+                name='title_category_name_idx'
+            ),
+            models.Index(fields=('rating',), name='title_rating_idx'),
+            models.Index(
+                fields=('weighted_rating',),
+                name='title_weighted_rating_idx'
+            ),
+            models.Index(
+                fields=('year', 'weighted_rating'),
+                name='title_year_weighted_idx'
+            ),
+            models.Index(
+                fields=('category', 'weighted_rating'),
+                name='title_category_weighted_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=('name', 'year', 'category'),
@@ -78,6 +269,25 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, force_insert=False, force_update=False, using=None,
+             update_fields=None):
+        """
+        Saving an existing title skips DENORMALIZED_FIELDS: values read
+        at the start of the request would overwrite concurrent reviews.
+        """
+        if not self._state.adding and update_fields is None:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in DENORMALIZED_FIELDS
+            ]
+        super().save(force_insert, force_update, using, update_fields)
+
+    @property
+    def score_histogram(self):
+        """Number of reviews with every score."""
+        return {score: getattr(self, f'score_{score}') for score in SCORES}
+
 
 class GenreTitle(models.Model):
     """
@@ -144,6 +354,12 @@ class Review(BaseModel):
     )
 
     class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -174,3 +390,9 @@ class Comment(BaseModel):
     class Meta(BaseModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        ]
@@ -0,0 +1,128 @@
+import re
+import sys
+
+from django.db import connections
+from django.db.models import Q
+
+FTS_TABLE = 'reviews_title_fts'
+CREATE_SQL = (
+    f'''CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )''',
+    f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+        AFTER INSERT ON reviews_title BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+        AFTER DELETE ON reviews_title BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END''',
+    f'''CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+        AFTER UPDATE OF name, description ON reviews_title BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END''',
+)
+REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+DROP_SQL = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+
+def create_search_index(connection, rebuild=False):
+    """
+    Create FTS5 index over Title name and description kept in sync
+    by triggers. Only SQLite is supported, other backends fall back
+    to plain lookups in search_titles.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sql in CREATE_SQL:
+            cursor.execute(sql)
+        if rebuild:
+            cursor.execute(REBUILD_SQL)
+
+
+def drop_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for sql in DROP_SQL:
+            cursor.execute(sql)
+
+
+def ensure_search_index(using, **kwargs):
+    """
+    post_migrate handler. SQLite migrations rebuild reviews_title table
+    when altering it, which drops its triggers, so create them again.
+    """
+    connection = connections[using]
+    if FTS_TABLE in connection.introspection.table_names():
+        create_search_index(connection)
+
+
+def normalize(value):
+    """
+    Case-fold value, replace 'ё' with 'е' and collapse whitespace.
+    SQLite folds case of ASCII letters only, so Cyrillic names are
+    searched by normalized copy.
+    """
+    return ' '.join(value.casefold().replace('ё', 'е').split())
+
+
+def prefix_lookup(field_name, value):
+    """
+    Lookup kwargs matching normalized field values starting with value.
+    Expressed as a range so any backend can use the field index.
+    The last code point has no successor, a prefix made of it only
+    has no upper bound.
+    """
+    value = normalize(value)
+    lookups = {f'{field_name}__gte': value}
+    prefix = value.rstrip(chr(sys.maxunicode))
+    if prefix:
+        lookups[f'{field_name}__lt'] = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return lookups
+
+
+def get_terms(value):
+    return re.findall(r'\w+', value)
+
+
+def search_titles(queryset, value):
+    """
+    Full text search of titles by name and description, ordered by
+    relevance. Every word of value matches as a prefix.
+    """
+    terms = get_terms(value)
+    if not terms:
+        return queryset.none()
+    if connections[queryset.db].vendor != 'sqlite':
+        condition = Q()
+        for term in terms:
+            condition &= (
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset.filter(condition)
+
+    match = ' '.join('"{}"*'.format(term) for term in terms)
+    return queryset.extra(
+        select={'search_rank': f'{FTS_TABLE}.rank'},
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE} MATCH %s',
+            f'{FTS_TABLE}.rowid = reviews_title.id',
+        ],
+        params=[match],
+        order_by=['search_rank', 'id'],
+    )
@@ -3,3 +3,13 @@ ROLES = (
     ('moderator', 'модератор'),
     ('admin', 'администратор'),
 )
+
+OUTBOX_STATUSES = (
+    ('pending', 'ожидает отправки'),
+    ('sent', 'отправлено'),
+    ('failed', 'не отправлено'),
+)
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 600
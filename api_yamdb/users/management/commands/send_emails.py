@@ -0,0 +1,138 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from users.constants import (
+    OUTBOX_BACKOFF_SECONDS,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_BACKOFF_SECONDS
+)
+from users.models import EmailOutbox
+
+
+class Command(BaseCommand):
+    """Command class. See help attribute for further info."""
+    help = '''Deliver pending emails from the outbox in batches over one
+        mail connection. Failed emails are retried with exponential
+        backoff and marked as failed after several attempts.
+        Use --loop to keep draining the outbox, it waits for an
+        unavailable mail server with exponential backoff as well.'''
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=OUTBOX_BATCH_SIZE,
+            help='How many emails to send over one connection.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling the outbox instead of exiting when empty.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait between polls of an empty outbox.'
+        )
+
+    def _claim(self, email):
+        """
+        Postpone email for the backoff time, so other workers skip it.
+        Return False if email was already taken or replaced.
+        """
+        return EmailOutbox.objects.filter(
+            pk=email.pk,
+            status='pending',
+            next_attempt=email.next_attempt
+        ).update(
+            next_attempt=timezone.now()
+            + timedelta(seconds=OUTBOX_BACKOFF_SECONDS)
+        ) == 1
+
+    def _mark_sent(self, email):
+        """Body check keeps a code queued meanwhile from being lost."""
+        EmailOutbox.objects.filter(
+            pk=email.pk,
+            body=email.body
+        ).update(status='sent', sent=timezone.now(), last_error='')
+
+    def _postpone(self, email, error):
+        attempts = email.attempts + 1
+        EmailOutbox.objects.filter(pk=email.pk, body=email.body).update(
+            attempts=attempts,
+            status='failed' if attempts >= OUTBOX_MAX_ATTEMPTS else 'pending',
+            next_attempt=timezone.now() + timedelta(
+                seconds=OUTBOX_BACKOFF_SECONDS * 2 ** attempts
+            ),
+            last_error=str(error)
+        )
+
+    def _send_batch(self, batch_size):
+        """
+        Send one batch. Return count of emails taken from the outbox.
+        Error of opening the mail connection is raised before any email
+        is claimed, so they all stay in the outbox untouched.
+        """
+        emails = list(EmailOutbox.objects.filter(
+            status='pending',
+            next_attempt__lte=timezone.now()
+        )[:batch_size])
+        if not emails:
+            return 0
+
+        sent = 0
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        with connection:
+            for email in emails:
+                if not self._claim(email):
+                    continue
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email,
+                    [email.email],
+                    connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    self._postpone(email, error)
+                else:
+                    self._mark_sent(email)
+                    sent += 1
+        self.stdout.write(f'Sent {sent} of {len(emails)} emails.')
+        return len(emails)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        failures = 0
+        while True:
+            try:
+                taken = self._send_batch(batch_size)
+            except OSError as error:
+                if not options['loop']:
+                    raise CommandError(f'Mail server is unavailable: {error}')
+                failures += 1
+                delay = min(
+                    options['interval'] * 2 ** failures,
+                    OUTBOX_MAX_BACKOFF_SECONDS
+                )
+                self.stderr.write(
+                    f'Mail server is unavailable: {error}. '
+                    f'Retry in {delay:g} seconds.'
+                )
+                time.sleep(delay)
+                continue
+            failures = 0
+            if taken == batch_size:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -1,7 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 
-from .constants import ROLES
+from .constants import OUTBOX_STATUSES, ROLES
 
 
 class User(AbstractUser):
@@ -29,3 +31,48 @@ class User(AbstractUser):
         if self.role == 'moderator':
             return True
         return False
+
+
+class EmailOutbox(models.Model):
+    """
+    Outgoing email waiting for delivery by send_emails command.
+    Only one pending email per address is kept, so repeated signups
+    replace the queued confirmation code instead of adding new emails.
+    """
+    email = models.EmailField('email адрес', max_length=254)
+    from_email = models.EmailField('Отправитель', max_length=254)
+    subject = models.CharField('Тема', max_length=256)
+    body = models.TextField('Текст письма')
+    status = models.CharField(
+        'Статус',
+        choices=OUTBOX_STATUSES,
+        default='pending',
+        max_length=7
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки отправки', default=0)
+    next_attempt = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Дата создания', auto_now_add=True)
+    sent = models.DateTimeField('Дата отправки', blank=True, null=True)
+
+    class Meta:
+        ordering = ('next_attempt', 'pk')
+        indexes = [
+            models.Index(
+                fields=('status', 'next_attempt'),
+                name='outbox_status_next_idx'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=('email',),
+                condition=Q(status='pending'),
+                name='single_pending_email'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} to {self.email}'
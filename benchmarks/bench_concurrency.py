@@ -0,0 +1,231 @@
+"""
+Concurrent reads and writes with the stock SQLite profile (rollback
+journal, deferred transactions, new connection for every request) and
+the tuned one from settings (SQLITE_PRAGMAS with WAL, immediate
+transactions, persistent connections).
+
+    python benchmarks/bench_concurrency.py --reviews 100000 --writers 4
+
+Every thread plays a server worker: requests go through the WSGI
+handler, so connections are opened and closed as in a threaded server.
+Readers get reviews, titles and pages of the catalog, writers change
+review scores and add comments. Errors are 5xx responses, mostly
+'database is locked' failures.
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+
+from common import seed, setup_django, summary
+
+# What Django gets without SQLITE_PRAGMAS: SQLite defaults and
+# the 5 seconds busy timeout of the sqlite3 module.
+STOCK_PROFILE = {
+    'busy_timeout': 5000,
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+    'mmap_size': 0,
+    'cache_size': -2000,
+}
+WRITER_REVIEWS = 20
+
+
+def make_client(headers=None):
+    """Return send(method, path, data=None) returning response status."""
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import RequestFactory
+
+    handler = WSGIHandler()
+    factory = RequestFactory(**(headers or {}))
+
+    def send(method, path, data=None):
+        if data is None:
+            request = getattr(factory, method)(path)
+        else:
+            request = getattr(factory, method)(
+                path, data=json.dumps(data), content_type='application/json'
+            )
+        statuses = []
+        response = handler(
+            request.environ, lambda status, headers: statuses.append(status)
+        )
+        # Sends request_finished which closes obsolete connections.
+        response.close()
+        return int(statuses[0].split()[0])
+
+    return send
+
+
+def get_context(writers):
+    """Hot titles with their reviews and a client with reviews per writer."""
+    from api.views import get_access_token
+    from reviews.models import Review, Title
+    from users.models import User
+
+    titles = list(Title.objects.order_by('-rating_count').values_list(
+        'pk', 'rating_count'
+    )[:WRITER_REVIEWS])
+    reviews = list(Review.objects.filter(
+        title__in=[pk for pk, _ in titles]
+    ).values_list('title_id', 'pk')[:1000])
+    accounts = []
+    for number in range(writers):
+        user, _ = User.objects.get_or_create(
+            username=f'bench_writer{number}',
+            defaults={'email': f'bench_writer{number}@yamdb.fake'}
+        )
+        own_reviews = [
+            Review.objects.get_or_create(
+                author=user, title_id=pk,
+                defaults={'text': 'Бенчмарк', 'score': 5}
+            )[0]
+            for pk, _ in titles
+        ]
+        Title.objects.filter(reviews__author=user).recalculate_rating()
+        token = get_access_token(user)['token']
+        accounts.append((
+            {'HTTP_AUTHORIZATION': f'Bearer {token}'},
+            [(review.title_id, review.pk) for review in own_reviews]
+        ))
+    return {
+        'titles': titles,
+        'reviews': reviews,
+        'title_pages': Title.objects.count() // 5 or 1,
+        'accounts': accounts,
+    }
+
+
+def read(send, rng, context):
+    title, count = rng.choice(context['titles'])
+    choice = rng.random()
+    if choice < 0.4:
+        page = rng.randint(1, count // 5 or 1)
+        return send('get', f'/api/v1/titles/{title}/reviews/?page={page}')
+    if choice < 0.7:
+        return send('get', f'/api/v1/titles/{title}/')
+    page = rng.randint(1, context['title_pages'])
+    return send('get', f'/api/v1/titles/?page={page}')
+
+
+def write(send, rng, own_reviews, context):
+    if rng.random() < 0.5:
+        title, review = rng.choice(own_reviews)
+        return send(
+            'patch', f'/api/v1/titles/{title}/reviews/{review}/',
+            {'score': rng.randint(1, 10)}
+        )
+    title, review = rng.choice(context['reviews'])
+    return send(
+        'post', f'/api/v1/titles/{title}/reviews/{review}/comments/',
+        {'text': 'Бенчмарк'}
+    )
+
+
+def worker(kind, request, deadline, seed_value, results, errors):
+    from django.db import connection
+
+    rng = random.Random(seed_value)
+    durations = []
+    failed = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if request(rng) >= 500:
+            failed += 1
+        durations.append((time.perf_counter() - started) * 1000)
+    connection.close()
+    results[kind].extend(durations)
+    errors[kind] += failed
+
+
+def run(pragmas, begin_immediate, conn_max_age, args, context):
+    """Run readers and writers for args.duration seconds."""
+    from django.conf import settings
+    from django.db import connection, connections
+
+    connection.close()
+    settings.SQLITE_PRAGMAS = pragmas
+    settings.SQLITE_BEGIN_IMMEDIATE = begin_immediate
+    connections.databases['default']['CONN_MAX_AGE'] = conn_max_age
+    # Journal mode is stored in the file, apply it before workers start.
+    connection.ensure_connection()
+    connection.close()
+
+    results = {'read': [], 'write': []}
+    errors = {'read': 0, 'write': 0}
+    deadline = time.perf_counter() + args.duration
+    threads = []
+    for number in range(args.readers):
+        send = make_client()
+        threads.append(threading.Thread(target=worker, args=(
+            'read', lambda rng, send=send: read(send, rng, context),
+            deadline, number, results, errors
+        )))
+    for number, (headers, own_reviews) in enumerate(context['accounts']):
+        send = make_client(headers)
+        threads.append(threading.Thread(target=worker, args=(
+            'write',
+            lambda rng, send=send, own_reviews=own_reviews: write(
+                send, rng, own_reviews, context
+            ),
+            deadline, 1000 + number, results, errors
+        )))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        kind: {
+            'requests': len(durations),
+            'rps': len(durations) / args.duration,
+            'errors': errors[kind],
+            **(summary(durations) if durations else {}),
+        }
+        for kind, durations in results.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reviews', type=int, default=10000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=5,
+                        help='Seconds to run every profile.')
+    parser.add_argument('--db', help='Reuse already seeded SQLite file.')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    from django.conf import settings
+
+    # Failed requests are counted, not logged with tracebacks.
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+    profiles = (
+        ('stock', STOCK_PROFILE, False, 0),
+        ('tuned', settings.SQLITE_PRAGMAS, settings.SQLITE_BEGIN_IMMEDIATE,
+         settings.DATABASES['default']['CONN_MAX_AGE']),
+    )
+    if not args.db:
+        seed(args.reviews)
+    context = get_context(args.writers)
+
+    print(f'{args.readers} readers, {args.writers} writers, '
+          f'{args.duration:g}s per profile')
+    print(f'{"profile":<8} {"kind":<6} {"requests":>9} {"rps":>8} '
+          f'{"errors":>7} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}')
+    for name, *profile in profiles:
+        result = run(*profile, args, context)
+        for kind, stats in result.items():
+            print(
+                f'{name:<8} {kind:<6} {stats["requests"]:>9} '
+                f'{stats["rps"]:>8.1f} {stats["errors"]:>7} '
+                f'{stats.get("p50", 0):>9.2f} {stats.get("p95", 0):>9.2f} '
+                f'{stats.get("p99", 0):>9.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
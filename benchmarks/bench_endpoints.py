@@ -0,0 +1,435 @@
+"""
+Latency and SQL query count of every API route at several data scales.
+
+    python benchmarks/bench_endpoints.py --reviews 1000 100000 1000000
+    python benchmarks/bench_endpoints.py --reviews 1000 --save-baseline
+
+Every scale is seeded into its own temporary SQLite database, requests
+go through the Django test client with real authentication. Results
+are compared with benchmarks/baseline.json: more queries than in the
+baseline or p95 slower than --tolerance times the baseline (and by more
+than --min-delta ms) is reported as a regression and makes the script
+exit with status 1. Latency baseline is only meaningful on the machine
+it was saved on, query counts are portable.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections import namedtuple
+
+from common import measure, seed, setup_django, summary, switch_database
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+BENCH_USERNAME = 'bench_user'
+BULK_ITEMS = 100
+
+Endpoint = namedtuple(
+    'Endpoint',
+    'name role method url data before after',
+    defaults=(None, None, None)
+)
+
+
+def delete_created(path):
+    """Remove object created by the measured request."""
+    def after(context, response):
+        context['clients']['admin'].delete(
+            path.format(**context, **response.json())
+        )
+    return after
+
+
+def request(path, role='admin', method='post', data=None):
+    def before(context):
+        send(context, role, method, path.format(**context), data)
+    return before
+
+
+def create(path, key, data, role='admin'):
+    """Create object for the measured request, keep its id in context."""
+    def before(context):
+        response = send(context, role, 'post', path.format(**context), data)
+        context[key] = response.json()['id']
+    return before
+
+
+def delete_bulk(model_name, **lookups):
+    """Remove rows created by the measured bulk request."""
+    def after(context, response):
+        from django.apps import apps
+
+        apps.get_model('reviews', model_name).objects.filter(
+            **lookups
+        ).delete()
+    return after
+
+
+BULK_SLUGGED = [
+    {'name': f'Бенчмарк {index}', 'slug': f'bench-bulk-{index}'}
+    for index in range(BULK_ITEMS)
+]
+BULK_TITLES = [
+    {'name': f'Бенчмарк {index}', 'year': 2000,
+     'category': '{category_slug}', 'genre': ['{genre_slug}']}
+    for index in range(BULK_ITEMS - 1)
+] + [{'id': '{hot_title}', 'description': 'Бенчмарк'}]
+
+
+ENDPOINTS = (
+    Endpoint('UsersSignUp.post', None, 'post', '/api/v1/auth/signup/',
+             {'username': BENCH_USERNAME, 'email': 'bench@yamdb.fake'}),
+    Endpoint('UsersTokenObtain.post', None, 'post', '/api/v1/auth/token/',
+             {'username': BENCH_USERNAME, 'confirmation_code': '{code}'}),
+    Endpoint('CategoryViewSet.list', None, 'get', '/api/v1/categories/'),
+    Endpoint('CategoryViewSet.list?search', None, 'get',
+             '/api/v1/categories/?search={category_name}'),
+    Endpoint('CategoryViewSet.create', 'admin', 'post', '/api/v1/categories/',
+             {'name': 'Бенчмарк', 'slug': 'bench'},
+             after=delete_created('/api/v1/categories/bench/')),
+    Endpoint('CategoryViewSet.destroy', 'admin', 'delete',
+             '/api/v1/categories/bench/',
+             before=request('/api/v1/categories/',
+                            data={'name': 'Бенчмарк', 'slug': 'bench'})),
+    Endpoint('CategoryViewSet.bulk', 'admin', 'post',
+             '/api/v1/categories/bulk/', BULK_SLUGGED,
+             after=delete_bulk('Category', slug__startswith='bench-bulk-')),
+    Endpoint('GenreViewSet.list', None, 'get', '/api/v1/genres/'),
+    Endpoint('GenreViewSet.create', 'admin', 'post', '/api/v1/genres/',
+             {'name': 'Бенчмарк', 'slug': 'bench'},
+             after=delete_created('/api/v1/genres/bench/')),
+    Endpoint('GenreViewSet.destroy', 'admin', 'delete',
+             '/api/v1/genres/bench/',
+             before=request('/api/v1/genres/',
+                            data={'name': 'Бенчмарк', 'slug': 'bench'})),
+    Endpoint('GenreViewSet.bulk', 'admin', 'post', '/api/v1/genres/bulk/',
+             BULK_SLUGGED,
+             after=delete_bulk('Genre', slug__startswith='bench-bulk-')),
+    Endpoint('TitleViewSet.list', None, 'get', '/api/v1/titles/'),
+    Endpoint('TitleViewSet.list?page', None, 'get',
+             '/api/v1/titles/?page={last_title_page}'),
+    Endpoint('TitleViewSet.list?genre', None, 'get',
+             '/api/v1/titles/?genre={genre_slug}'),
+    Endpoint('TitleViewSet.list?category', None, 'get',
+             '/api/v1/titles/?category={category_slug}&year={hot_year}'),
+    Endpoint('TitleViewSet.list?name', None, 'get',
+             '/api/v1/titles/?name={title_prefix}'),
+    Endpoint('TitleViewSet.list?search', None, 'get',
+             '/api/v1/titles/?search={title_word}'),
+    Endpoint('TitleViewSet.list?ordering', None, 'get',
+             '/api/v1/titles/?ordering=-rating&page={last_title_page}'),
+    Endpoint('TitleViewSet.top', None, 'get', '/api/v1/titles/top/'),
+    Endpoint('TitleViewSet.top?category', None, 'get',
+             '/api/v1/titles/top/?category={category_slug}&limit=100'),
+    Endpoint('TitleViewSet.retrieve', None, 'get',
+             '/api/v1/titles/{hot_title}/'),
+    Endpoint('TitleViewSet.score_histogram', None, 'get',
+             '/api/v1/titles/{hot_title}/score_histogram/'),
+    Endpoint('TitleViewSet.create', 'admin', 'post', '/api/v1/titles/',
+             {'name': 'Бенчмарк', 'year': 2000, 'category': '{category_slug}',
+              'genre': ['{genre_slug}']},
+             after=delete_created('/api/v1/titles/{id}/')),
+    Endpoint('TitleViewSet.partial_update', 'admin', 'patch',
+             '/api/v1/titles/{hot_title}/', {'description': 'Бенчмарк'}),
+    Endpoint('TitleViewSet.destroy', 'admin', 'delete',
+             '/api/v1/titles/{bench_title}/',
+             before=create('/api/v1/titles/', 'bench_title', {
+                 'name': 'Бенчмарк удаление', 'year': 2000,
+                 'category': '{category_slug}', 'genre': ['{genre_slug}']
+             })),
+    Endpoint('TitleViewSet.bulk', 'admin', 'post', '/api/v1/titles/bulk/',
+             BULK_TITLES,
+             after=delete_bulk('Title', name__startswith='Бенчмарк ')),
+    Endpoint('TitleViewSet.export?category', 'admin', 'get',
+             '/api/v1/titles/export/?category={category_slug}'),
+    Endpoint('TitleViewSet.export?reviews', 'admin', 'get',
+             '/api/v1/titles/export/?category={category_slug}'
+             '&year={hot_year}&reviews=1'),
+    Endpoint('ReviewViewSet.list', None, 'get',
+             '/api/v1/titles/{hot_title}/reviews/'),
+    Endpoint('ReviewViewSet.list?page', None, 'get',
+             '/api/v1/titles/{hot_title}/reviews/?page={last_review_page}'),
+    Endpoint('ReviewViewSet.list?cursor', None, 'get',
+             '/api/v1/titles/{hot_title}/reviews/?cursor='),
+    Endpoint('ReviewViewSet.retrieve', None, 'get',
+             '/api/v1/titles/{hot_title}/reviews/{hot_review}/'),
+    Endpoint('ReviewViewSet.create', 'user', 'post',
+             '/api/v1/titles/{cold_title}/reviews/',
+             {'text': 'Бенчмарк', 'score': 7},
+             after=delete_created(
+                 '/api/v1/titles/{cold_title}/reviews/{id}/'
+             )),
+    Endpoint('ReviewViewSet.partial_update', 'user', 'patch',
+             '/api/v1/titles/{hot_title}/reviews/{user_review}/',
+             {'score': 3}),
+    Endpoint('ReviewViewSet.destroy', 'user', 'delete',
+             '/api/v1/titles/{cold_title}/reviews/{bench_review}/',
+             before=create('/api/v1/titles/{cold_title}/reviews/',
+                           'bench_review',
+                           {'text': 'Бенчмарк', 'score': 7}, role='user')),
+    Endpoint('CommentViewSet.list', None, 'get',
+             '/api/v1/titles/{hot_title}/reviews/{hot_review}/comments/'),
+    Endpoint('CommentViewSet.retrieve', None, 'get',
+             '/api/v1/titles/{hot_title}/reviews/{hot_review}/comments/'
+             '{hot_comment}/'),
+    Endpoint('CommentViewSet.create', 'user', 'post',
+             '/api/v1/titles/{hot_title}/reviews/{hot_review}/comments/',
+             {'text': 'Бенчмарк'},
+             after=delete_created(
+                 '/api/v1/titles/{hot_title}/reviews/{hot_review}/comments/'
+                 '{id}/'
+             )),
+    Endpoint('CommentViewSet.partial_update', 'user', 'patch',
+             '/api/v1/titles/{hot_title}/reviews/{hot_review}/comments/'
+             '{user_comment}/', {'text': 'Бенчмарк'}),
+    Endpoint('CommentViewSet.destroy', 'user', 'delete',
+             '/api/v1/titles/{hot_title}/reviews/{hot_review}/comments/'
+             '{bench_comment}/',
+             before=create(
+                 '/api/v1/titles/{hot_title}/reviews/{hot_review}/comments/',
+                 'bench_comment', {'text': 'Бенчмарк'}, role='user'
+             )),
+    Endpoint('UserViewSet.list', 'admin', 'get', '/api/v1/users/'),
+    Endpoint('UserViewSet.retrieve', 'admin', 'get',
+             f'/api/v1/users/{BENCH_USERNAME}/'),
+    Endpoint('UserViewSet.create', 'admin', 'post', '/api/v1/users/',
+             {'username': 'bench_created', 'email': 'created@yamdb.fake'},
+             after=delete_created('/api/v1/users/bench_created/')),
+    Endpoint('UserViewSet.partial_update', 'admin', 'patch',
+             f'/api/v1/users/{BENCH_USERNAME}/', {'bio': 'Бенчмарк'}),
+    Endpoint('UserViewSet.destroy', 'admin', 'delete',
+             '/api/v1/users/bench_deleted/',
+             before=request('/api/v1/users/', data={
+                 'username': 'bench_deleted', 'email': 'deleted@yamdb.fake'
+             })),
+    Endpoint('UserViewSet.me', 'user', 'get', '/api/v1/users/me/'),
+    Endpoint('UserViewSet.me.patch', 'user', 'patch', '/api/v1/users/me/',
+             {'bio': 'Бенчмарк'}),
+)
+
+
+def fill(data, context):
+    """Substitute context values into strings of request data."""
+    if isinstance(data, dict):
+        return {key: fill(value, context) for key, value in data.items()}
+    if isinstance(data, list):
+        return [fill(value, context) for value in data]
+    if isinstance(data, str):
+        return data.format(**context)
+    return data
+
+
+def send(context, role, method, path, data=None):
+    client = context['clients'][role]
+    if data is None:
+        return getattr(client, method)(path)
+    return getattr(client, method)(
+        path,
+        data=json.dumps(fill(data, context)),
+        content_type='application/json'
+    )
+
+
+def get_context():
+    """Objects referenced by endpoint urls and authenticated clients."""
+    from django.contrib.auth.tokens import default_token_generator
+    from django.db.models import Count
+    from django.test import Client
+
+    from api.views import get_access_token
+    from reviews.models import Category, Comment, Genre, Review, Title
+    from users.models import User
+
+    admin, _ = User.objects.get_or_create(
+        username='bench_admin',
+        defaults={'email': 'bench_admin@yamdb.fake', 'role': 'admin'}
+    )
+    user, _ = User.objects.get_or_create(
+        username=BENCH_USERNAME, defaults={'email': 'bench@yamdb.fake'}
+    )
+    clients = {None: Client()}
+    for role, account in (('admin', admin), ('user', user)):
+        token = get_access_token(account)['token']
+        clients[role] = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    hot_title = Title.objects.order_by('-rating_count').first()
+    cold_title = Title.objects.order_by('rating_count', 'pk').exclude(
+        reviews__author=user
+    ).first()
+    category = Category.objects.first()
+    hot_review = hot_title.reviews.annotate(
+        comment_count=Count('comments')
+    ).order_by('-comment_count').first()
+    user_review, _ = Review.objects.get_or_create(
+        author=user, title=hot_title,
+        defaults={'text': 'Бенчмарк', 'score': 5}
+    )
+    user_comment, _ = Comment.objects.get_or_create(
+        author=user, review=hot_review, defaults={'text': 'Бенчмарк'}
+    )
+    context = {
+        'clients': clients,
+        'code': default_token_generator.make_token(user),
+        'hot_title': hot_title.pk,
+        'hot_year': hot_title.year,
+        'cold_title': cold_title.pk,
+        'title_prefix': hot_title.name[:4],
+        'title_word': hot_title.name.split()[0],
+        'last_title_page': Title.objects.count() // 5 or 1,
+        'hot_review': hot_review.pk,
+        'last_review_page': hot_title.reviews.count() // 5 or 1,
+        'user_review': user_review.pk,
+        'user_comment': user_comment.pk,
+        'hot_comment': hot_review.comments.values_list(
+            'pk', flat=True
+        ).first(),
+        'category_slug': category.slug,
+        'category_name': category.name[:3],
+        'genre_slug': Genre.objects.values_list('slug', flat=True).first(),
+    }
+    return context
+
+
+def run_endpoint(endpoint, context, repeat, warm):
+    """Return query count of the measured request and latency summary."""
+    from django.core.cache import caches
+    from django.db import connection, reset_queries
+    from django.test.utils import CaptureQueriesContext
+
+    from api.cache import CACHE_ALIAS
+
+    def before():
+        if not warm:
+            caches[CACHE_ALIAS].clear()
+        if endpoint.before:
+            endpoint.before(context)
+
+    def call():
+        response = send(
+            context, endpoint.role, endpoint.method,
+            endpoint.url.format(**context), endpoint.data
+        )
+        if response.streaming:
+            # Queries of a streaming response run while it is consumed.
+            b''.join(response.streaming_content)
+        return response
+
+    def after(response):
+        assert response.status_code < 400, (
+            endpoint.name, response.status_code, response.content[:200]
+        )
+        if endpoint.after:
+            endpoint.after(context, response)
+
+    before()
+    # Every request resets the query log, so count before the next one.
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        response = call()
+    count = len(queries.captured_queries)
+    after(response)
+    durations = measure(call, repeat, before, after)
+    return count, summary(durations)
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """
+    Return list of regression messages. Latency differences below
+    min_delta milliseconds are noise on fast endpoints and are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['queries'] > base['queries']:
+            regressions.append(
+                f'{name}: {result["queries"]} queries, '
+                f'baseline {base["queries"]}'
+            )
+        slower = result['p95'] - base['p95']
+        if result['p95'] > base['p95'] * tolerance and slower > min_delta:
+            regressions.append(
+                f'{name}: p95 {result["p95"]:.2f} ms, '
+                f'baseline {base["p95"]:.2f} ms'
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reviews', type=int, nargs='+', default=[1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--db', help='Reuse already seeded SQLite file.')
+    parser.add_argument('--warm', action='store_true',
+                        help='Keep response cache between requests.')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=2)
+    parser.add_argument('--min-delta', type=float, default=5,
+                        help='Ignore p95 differences below it, ms.')
+    parser.add_argument('--only', help='Measure endpoints containing text.')
+    args = parser.parse_args()
+    if args.db and len(args.reviews) > 1:
+        parser.error('--db can be used with a single --reviews value.')
+
+    directory = tempfile.mkdtemp()
+    paths = [
+        args.db or os.path.join(directory, f'bench_{reviews}.sqlite3')
+        for reviews in args.reviews
+    ]
+    setup_django(paths[0])
+    from django.test.utils import setup_test_environment
+
+    from reviews.models import Review
+
+    setup_test_environment()
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf8') as file:
+            baseline = json.load(file)
+
+    regressions = []
+    for index, (reviews, path) in enumerate(zip(args.reviews, paths)):
+        if index:
+            switch_database(path)
+        if not Review.objects.exists():
+            seed(reviews)
+        context = get_context()
+        print(f'\n{Review.objects.count()} reviews')
+        print(f'{"endpoint":<34}{"queries":>8}{"p50 ms":>10}'
+              f'{"p95 ms":>10}{"p99 ms":>10}')
+        results = {}
+        for endpoint in ENDPOINTS:
+            if args.only and args.only not in endpoint.name:
+                continue
+            queries, stats = run_endpoint(
+                endpoint, context, args.repeat, args.warm
+            )
+            results[endpoint.name] = {
+                'queries': queries,
+                **{key: round(value, 3) for key, value in stats.items()}
+            }
+            print(f'{endpoint.name:<34}{queries:>8}{stats["p50"]:>10.2f}'
+                  f'{stats["p95"]:>10.2f}{stats["p99"]:>10.2f}')
+        regressions += [
+            f'{reviews} reviews, {message}' for message in compare(
+                results, baseline.get(str(reviews), {}),
+                args.tolerance, args.min_delta
+            )
+        ]
+        baseline.setdefault(str(reviews), {}).update(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf8') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f'\nBaseline saved to {args.baseline}')
+    elif regressions:
+        print('\nRegressions:')
+        print('\n'.join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
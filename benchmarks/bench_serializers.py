@@ -0,0 +1,91 @@
+"""
+Model serializers against row serializers of the read paths.
+
+    python benchmarks/bench_serializers.py --reviews 100000 --rows 5 100 1000
+
+Every case fetches the same page and serializes it both ways: model
+serializer over instances (related objects are loaded with
+select_related and prefetch_related) and row serializer over values()
+rows. Time includes the queries, speedup is the ratio of medians.
+"""
+import argparse
+
+from common import measure, seed, setup_django, summary
+
+
+def get_cases():
+    from django.db.models import Count
+
+    from api.row_serializers import (
+        CommentRowSerializer,
+        ReviewRowSerializer,
+        TitleRowSerializer,
+        TopTitleRowSerializer
+    )
+    from api.serializers import (
+        CommentSerializer,
+        ReviewSerializer,
+        TitleSerializer,
+        TopTitleSerializer
+    )
+    from reviews.models import Comment, Review, Title
+
+    titles = Title.objects.select_related('category').prefetch_related('genre')
+    hot_title = Title.objects.order_by('-rating_count').first()
+    hot_review = Review.objects.annotate(
+        total=Count('comments')
+    ).order_by('-total').first()
+    return (
+        ('titles', TitleSerializer, TitleRowSerializer, titles, {}),
+        ('titles?score_histogram', TitleSerializer, TitleRowSerializer,
+         titles, {'score_histogram': True}),
+        ('titles/top', TopTitleSerializer, TopTitleRowSerializer,
+         titles.filter(weighted_rating__isnull=False).order_by(
+             '-weighted_rating', '-pk'
+         ), {}),
+        ('reviews', ReviewSerializer, ReviewRowSerializer,
+         Review.objects.filter(title=hot_title).select_related('author'), {}),
+        ('comments', CommentSerializer, CommentRowSerializer,
+         Comment.objects.filter(review=hot_review).select_related('author'),
+         {}),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reviews', type=int, default=10000)
+    parser.add_argument('--rows', type=int, nargs='+', default=[5, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--db', help='Reuse already seeded SQLite file.')
+    args = parser.parse_args()
+
+    setup_django(args.db)
+    if not args.db:
+        seed(args.reviews)
+
+    print(f'{"case":<24}{"rows":>6}{"model ms":>10}{"rows ms":>10}'
+          f'{"speedup":>9}')
+    for name, serializer_class, row_serializer_class, queryset, context in (
+        get_cases()
+    ):
+        rows = row_serializer_class(context=context).values(queryset)
+        for size in args.rows:
+            def model():
+                return serializer_class(
+                    list(queryset[:size]), many=True, context=context
+                ).data
+
+            def row():
+                return row_serializer_class(
+                    list(rows[:size]), many=True, context=context
+                ).data
+
+            found = len(row())
+            model_p50 = summary(measure(model, args.repeat))['p50']
+            row_p50 = summary(measure(row, args.repeat))['p50']
+            print(f'{name:<24}{found:>6}{model_p50:>10.2f}{row_p50:>10.2f}'
+                  f'{model_p50 / row_p50:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
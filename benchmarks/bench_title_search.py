@@ -0,0 +1,69 @@
+"""
+Compare title filters with the old `name` contains filter.
+
+    python benchmarks/bench_title_search.py --titles 1000000
+
+'contains' is the old filter, LIKE '%x%' scanning every row, 'name' is
+the indexed prefix filter replacing it and 'search' is full text search.
+Seeds a temporary SQLite database, so it takes a while on large sizes.
+"""
+import argparse
+
+from common import VOCABULARY, make_rng, measure, setup_django, summary, words
+
+# Words from frequent to rare ones, a pair and a prefix.
+QUERIES = tuple(VOCABULARY[rank] for rank in (0, 10, 100, 1000, 10000)) + (
+    f'{VOCABULARY[5]} {VOCABULARY[50]}',
+    VOCABULARY[200][:3],
+)
+
+
+def seed(titles, batch_size=10000):
+    from reviews.models import Title
+
+    rng = make_rng()
+    for start in range(0, titles, batch_size):
+        Title.objects.bulk_create(
+            Title(
+                name=f'{words(rng, rng.randint(1, 4))} {index}',
+                description=words(rng, rng.randint(5, 30)),
+                year=rng.randint(1800, 2022)
+            )
+            for index in range(start, min(start + batch_size, titles))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--db', help='Reuse already seeded SQLite file.')
+    args = parser.parse_args()
+
+    db_path = setup_django(args.db)
+    from api.filters import TitleFilters
+    from reviews.models import Title
+
+    if not Title.objects.exists():
+        seed(args.titles)
+    print(f'{Title.objects.count()} titles in {db_path}')
+
+    def page(name, query):
+        if name == 'contains':
+            queryset = Title.objects.filter(name__contains=query)
+        else:
+            queryset = TitleFilters(
+                {name: query}, queryset=Title.objects.all()
+            ).qs
+        return lambda: (queryset.count(), list(queryset[:5]))
+
+    print(f'{"query":<20}{"filter":<10}{"p50 ms":>10}{"p95 ms":>10}')
+    for query in QUERIES:
+        for name in ('contains', 'name', 'search'):
+            stats = summary(measure(page(name, query), args.repeat))
+            print(f'{query:<20}{name:<10}{stats["p50"]:>10.2f}'
+                  f'{stats["p95"]:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Helpers shared by benchmark scripts. Not a part of the test suite."""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api_yamdb'
+)
+sys.path.insert(0, PROJECT_DIR)
+
+# Shared with generate_data command, importable without Django setup.
+from reviews.generators import (  # noqa: E402, F401
+    VOCABULARY,
+    WEIGHTS,
+    words,
+    zipf_weights
+)
+
+
+def setup_django(db_path=None):
+    """
+    Configure project settings to use a separate SQLite file
+    and migrate it. Return path of the database file.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = db_path
+    settings.DEBUG = False
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def seed(reviews):
+    """Seed data with a few hot titles, see generate_data command."""
+    from django.core.management import call_command
+
+    call_command(
+        'generate_data',
+        users=max(reviews // 5, 100),
+        titles=max(reviews // 20, 50),
+        reviews=reviews,
+        comments=reviews // 2,
+        stdout=sys.stderr
+    )
+
+
+def switch_database(db_path):
+    """Point already configured project to another SQLite file."""
+    from django.core.management import call_command
+    from django.db import connection
+
+    connection.close()
+    connection.settings_dict['NAME'] = db_path
+    call_command('migrate', verbosity=0)
+    return db_path
+
+
+def make_rng(seed=0):
+    return random.Random(seed)
+
+
+def measure(func, repeat, before=None, after=None):
+    """
+    Call func repeat times, return list of durations in milliseconds.
+    Untimed before() runs ahead of every call, after(result) after it.
+    """
+    durations = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - started) * 1000)
+        if after is not None:
+            after(result)
+    return durations
+
+
+def percentile(durations, percent):
+    ordered = sorted(durations)
+    index = round(percent / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+def summary(durations):
+    return {
+        'p50': statistics.median(durations),
+        'p95': percentile(durations, 95),
+        'p99': percentile(durations, 99),
+    }
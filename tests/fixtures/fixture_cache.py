@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import caches
+    from api.authentication import user_cache
+
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
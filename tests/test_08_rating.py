@@ -0,0 +1,93 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08Rating:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_stored_on_title(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        from reviews.models import Title
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3), (
+            'Проверьте, что при создании отзыва обновляются поля '
+            '`rating_sum` и `rating_count` произведения'
+        )
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (18, 3), (
+            'Проверьте, что при изменении оценки отзыва обновляется '
+            '`rating_sum` произведения'
+        )
+        for review in reviews:
+            admin_client.delete(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/'
+            )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (0, 0), (
+            'Проверьте, что при удалении отзывов обновляются поля '
+            '`rating_sum` и `rating_count` произведения'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') is None, (
+            'Проверьте, что `rating` произведения без отзывов равен `None`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recalculate_ratings_command(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        from reviews.models import Title
+
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('recalculate_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (12, 3, 4), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'рейтинг произведений по отзывам'
+        )
+        title = Title.objects.get(pk=titles[1]['id'])
+        assert (title.rating_count, title.rating) == (0, None), (
+            'Проверьте, что команда `recalculate_ratings` оставляет пустой '
+            'рейтинг у произведений без отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_title_save_keeps_rating(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        from reviews.models import Title
+
+        stale = Title.objects.get(pk=titles[0]['id'])
+        auth_client(user).delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/')
+        stale.description = 'Изменено'
+        stale.save()
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.description, title.rating_sum, title.rating_count, title.score_3) == (
+            'Изменено', 9, 2, 0
+        ), (
+            'Проверьте, что сохранение произведения не перезаписывает рейтинг, '
+            'изменённый отзывами за это время'
+        )
+        response = admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Новое'})
+        assert response.status_code == 200 and response.json()['rating'] == 4, (
+            'Проверьте, что изменение произведения сохраняет его рейтинг'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_cascade_delete_updates_rating(self, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        from reviews.models import Title
+
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (
+            title.rating_sum, title.rating_count, title.rating, title.score_3
+        ) == (9, 2, 4.5, 0), (
+            'Проверьте, что удаление автора вместе с отзывами обновляет рейтинг произведения'
+        )
@@ -0,0 +1,50 @@
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+
+def create_catalog(size):
+    from reviews.models import Category, Genre, GenreTitle, Title
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}') for index in range(3)
+    )
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {index}', year=2000, category=category)
+        for index in range(size)
+    )
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genre)
+        for title in Title.objects.all() for genre in genres
+    )
+    return Title.objects.first()
+
+
+class Test09TitleQueries:
+
+    @pytest.mark.parametrize('page_size', (5, 50, 500))
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_list_query_count(self, client, monkeypatch,
+                                       django_assert_num_queries, page_size):
+        create_catalog(page_size)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        data = response.json()
+        assert len(data['results']) == page_size, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращаете данные с пагинацией'
+        )
+        assert len(data['results'][0]['genre']) == 3, (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращаются все жанры произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_query_count(self, client,
+                                         django_assert_num_queries):
+        title = create_catalog(5)
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.json()['category']['slug'] == 'films', (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/` возвращается категория произведения'
+        )
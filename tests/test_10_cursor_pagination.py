@@ -0,0 +1,56 @@
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+from .common import create_comments, create_reviews
+
+
+def walk_cursor(client, url):
+    ids, previous = [], None
+    response = client.get(f'{url}?cursor=')
+    assert response.status_code == 200, (
+        f'Проверьте, что при GET запросе `{url}?cursor=` возвращается статус 200'
+    )
+    data = response.json()
+    assert 'count' not in data and data['previous'] is None, (
+        f'Проверьте, что при GET запросе `{url}?cursor=` возвращается первая страница '
+        'без параметра `count`'
+    )
+    while True:
+        ids.extend(item['id'] for item in data['results'])
+        if data['next'] is None:
+            return ids, previous
+        previous = data['next']
+        data = client.get(data['next']).json()
+
+
+class Test10CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_cursor(self, client, admin_client, admin, monkeypatch):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 2)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        ids, last_page = walk_cursor(client, url)
+        assert ids == [review['id'] for review in reversed(reviews)], (
+            f'Проверьте, что при GET запросе `{url}?cursor=` отзывы возвращаются '
+            'от новых к старым без пропусков и повторов'
+        )
+        data = client.get(client.get(last_page).json()['previous']).json()
+        assert [item['id'] for item in data['results']] == ids[:2], (
+            f'Проверьте, что при GET запросе `{url}?cursor=` ссылка `previous` '
+            'ведет на предыдущую страницу'
+        )
+        assert client.get(f'{url}?cursor=invalid').status_code == 404, (
+            f'Проверьте, что при GET запросе `{url}` с неверным курсором возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_cursor(self, client, admin_client, admin, monkeypatch):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 2)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        ids, _ = walk_cursor(client, url)
+        assert ids == [comment['id'] for comment in reversed(comments)], (
+            f'Проверьте, что при GET запросе `{url}?cursor=` комментарии возвращаются '
+            'от новых к старым без пропусков и повторов'
+        )
@@ -0,0 +1,127 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class Test11EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_queues_email(self, client):
+        from users.models import EmailOutbox
+
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200, (
+            f'Проверьте, что при POST запросе `{self.url_signup}` с валидными данными возвращается статус 200'
+        )
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что при POST запросе `{self.url_signup}` письмо не отправляется во время запроса'
+        )
+        assert EmailOutbox.objects.filter(email=data['email'], status='pending').count() == 1, (
+            f'Проверьте, что при POST запросе `{self.url_signup}` письмо добавляется в очередь отправки'
+        )
+
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_emails` отправляет письма из очереди'
+        )
+        assert EmailOutbox.objects.get(email=data['email']).status == 'sent', (
+            'Проверьте, что команда `send_emails` отмечает письмо отправленным'
+        )
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_emails` не отправляет письма повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_repeated_signup_sends_one_email(self, client):
+        from users.models import EmailOutbox
+
+        outbox_before_count = len(mail.outbox)
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        for _ in range(3):
+            client.post(self.url_signup, data=data)
+        assert EmailOutbox.objects.filter(email=data['email']).count() == 1, (
+            f'Проверьте, что повторные POST запросы `{self.url_signup}` не добавляют письма в очередь'
+        )
+        body = EmailOutbox.objects.get(email=data['email']).body
+
+        call_command('send_emails')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            f'Проверьте, что после повторных POST запросов `{self.url_signup}` отправляется одно письмо'
+        )
+        assert mail.outbox[-1].body == body and mail.outbox[-1].to == [data['email']], (
+            'Проверьте, что отправляется письмо с последним кодом подтверждения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_failed_email_retried_with_backoff(self, client, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from users.constants import OUTBOX_MAX_ATTEMPTS
+        from users.models import EmailOutbox
+
+        def broken_send_messages(self, messages):
+            raise ConnectionError('Mail server is down')
+
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        client.post(self.url_signup, data=data)
+        monkeypatch.setattr(EmailBackend, 'send_messages', broken_send_messages)
+
+        call_command('send_emails')
+        email = EmailOutbox.objects.get(email=data['email'])
+        assert (email.status, email.attempts) == ('pending', 1), (
+            'Проверьте, что неотправленное письмо остается в очереди'
+        )
+        assert email.next_attempt > timezone.now() and email.last_error, (
+            'Проверьте, что повторная отправка письма откладывается'
+        )
+        for _ in range(OUTBOX_MAX_ATTEMPTS - 1):
+            EmailOutbox.objects.update(next_attempt=timezone.now())
+            call_command('send_emails')
+        assert EmailOutbox.objects.get(email=data['email']).status == 'failed', (
+            'Проверьте, что после нескольких неудачных попыток письмо отмечается неотправленным'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_mail_server_unavailable(self, client, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from django.core.management import CommandError
+        from users.management.commands import send_emails
+        from users.models import EmailOutbox
+
+        open_mail_connection = EmailBackend.open
+        delays = []
+
+        def broken_open(self):
+            if len(delays) < 3:
+                raise ConnectionRefusedError('Mail server is down')
+            return open_mail_connection(self)
+
+        def sleep(delay):
+            delays.append(delay)
+            if len(delays) == 4:
+                raise KeyboardInterrupt
+
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        client.post(self.url_signup, data=data)
+        monkeypatch.setattr(EmailBackend, 'open', broken_open)
+        with pytest.raises(CommandError):
+            call_command('send_emails')
+        email = EmailOutbox.objects.get(email=data['email'])
+        assert (email.status, email.attempts) == ('pending', 0), (
+            'Проверьте, что при недоступном почтовом сервере письмо остаётся в очереди'
+        )
+
+        outbox_before_count = len(mail.outbox)
+        monkeypatch.setattr(send_emails.time, 'sleep', sleep)
+        with pytest.raises(KeyboardInterrupt):
+            call_command('send_emails', loop=True, interval=1)
+        assert delays == [2, 4, 8, 1], (
+            'Проверьте, что `send_emails --loop` ждёт почтовый сервер с экспоненциальной задержкой'
+        )
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что `send_emails --loop` отправляет письма, когда сервер снова доступен'
+        )
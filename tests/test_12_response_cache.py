@@ -0,0 +1,90 @@
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+class Test12ResponseCache:
+
+    @pytest.mark.parametrize('url', ('/api/v1/categories/', '/api/v1/genres/', '/api/v1/titles/'))
+    @pytest.mark.django_db(transaction=True)
+    def test_01_list_cached(self, client, admin_client, django_assert_num_queries, url):
+        from api.cache import get_stats
+
+        create_titles(admin_client)
+        response = client.get(f'{url}?page=1')
+        assert response['X-Cache'] == 'MISS', (
+            f'Проверьте, что первый GET запрос `{url}` не обслуживается из кэша'
+        )
+        with django_assert_num_queries(0):
+            cached = client.get(f'{url}?page=1')
+        assert cached['X-Cache'] == 'HIT' and cached.json() == response.json(), (
+            f'Проверьте, что повторный GET запрос `{url}` обслуживается из кэша'
+        )
+        assert get_stats() == {'hits': 1, 'misses': 1}, (
+            'Проверьте, что считаются попадания и промахи кэша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_query_string_normalized(self, client, admin_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/?year=2000&category=films')
+        response = client.get('/api/v1/titles/?category=films&year=2000')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что порядок параметров запроса не влияет на ключ кэша'
+        )
+        response = client.get('/api/v1/titles/?category=books&year=2000')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что разные параметры запроса кэшируются отдельно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_invalidated_on_changes(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        client.get('/api/v1/categories/')
+        admin_client.delete('/api/v1/categories/films/')
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS' and response.json()['count'] == 1, (
+            'Проверьте, что кэш сбрасывается при удалении категории'
+        )
+
+        client.get('/api/v1/titles/')
+        admin_client.patch(f'/api/v1/titles/{titles[0]["id"]}/', data={'genre': ['drama']})
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что кэш сбрасывается при изменении жанров произведения'
+        )
+
+        client.get('/api/v1/titles/')
+        admin_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'qwerty', 'score': 8})
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что кэш сбрасывается при добавлении отзывов'
+        )
+        ratings = {title['id']: title['rating'] for title in response.json()['results']}
+        assert ratings[titles[1]['id']] == 8, (
+            'Проверьте, что после сброса кэша рейтинг произведений актуален'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_invalidated_after_commit(self):
+        from django.db import transaction
+        from api.cache import get_generation
+        from reviews.models import Category, Genre
+
+        generation = get_generation()
+        with transaction.atomic():
+            category = Category.objects.create(name='Фильмы', slug='films')
+            Genre.objects.create(name='Драма', slug='drama').delete()
+            assert get_generation() == generation, (
+                'Проверьте, что кэш ответов сбрасывается только после фиксации транзакции'
+            )
+        assert get_generation() != generation, (
+            'Проверьте, что кэш ответов сбрасывается после фиксации транзакции'
+        )
+        generation = get_generation()
+        with transaction.atomic():
+            category.delete()
+            transaction.set_rollback(True)
+        assert get_generation() == generation, (
+            'Проверьте, что откаченная транзакция не сбрасывает кэш ответов'
+        )
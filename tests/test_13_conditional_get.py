@@ -0,0 +1,102 @@
+import pytest
+
+from .common import create_comments
+
+
+def assert_not_modified(client, url):
+    response = client.get(url)
+    assert response.status_code == 200 and response.has_header('ETag'), (
+        f'Проверьте, что при GET запросе `{url}` возвращается заголовок `ETag`'
+    )
+    assert response.has_header('Last-Modified'), (
+        f'Проверьте, что при GET запросе `{url}` возвращается заголовок `Last-Modified`'
+    )
+    etag = response['ETag']
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304 and not response.content, (
+        f'Проверьте, что при GET запросе `{url}` с неизменным `If-None-Match` возвращается статус 304'
+    )
+    return etag
+
+
+class Test13ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_title_detail(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = assert_not_modified(client, url)
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304, (
+            f'Проверьте, что при GET запросе `{url}` с `If-Modified-Since` возвращается статус 304'
+        )
+
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[2]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag, (
+            f'Проверьте, что при удалении отзыва меняется `ETag` ответа `{url}`'
+        )
+        assert client.get('/api/v1/titles/0/', HTTP_IF_NONE_MATCH=etag).status_code == 404, (
+            'Проверьте, что при GET запросе несуществующего произведения возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_list(self, client, admin_client, admin):
+        _, _, titles, _, _ = create_comments(admin_client, admin)
+        url = '/api/v1/titles/'
+        etag = assert_not_modified(client, url)
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Проект 2'})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            f'Проверьте, что при изменении произведения меняется `ETag` ответа `{url}`'
+        )
+        assert client.get(f'{url}?year=2000', HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            f'Проверьте, что `ETag` ответа `{url}` зависит от параметров запроса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_and_comments(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        reviews_etag = assert_not_modified(client, reviews_url)
+        comments_etag = assert_not_modified(client, comments_url)
+        assert_not_modified(client, f'{comments_url}{comments[0]["id"]}/')
+
+        admin_client.patch(f'{comments_url}{comments[0]["id"]}/', data={'text': 'изменено'})
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == 200 and response['ETag'] != comments_etag, (
+            f'Проверьте, что при изменении комментария меняется `ETag` ответа `{comments_url}`'
+        )
+        admin_client.patch(f'{reviews_url}{reviews[0]["id"]}/', data={'text': 'изменено'})
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == 200, (
+            f'Проверьте, что при изменении отзыва меняется `ETag` ответа `{reviews_url}`'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_author_renamed(self, client, admin_client, admin):
+        from .common import auth_client
+
+        _, reviews, titles, _, moderator = create_comments(admin_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Отзыв', 'score': 5}
+        )
+        comments_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/{response.json()["id"]}/comments/'
+        auth_client(moderator).post(comments_url, data={'text': 'Комментарий'})
+        etags = {url: assert_not_modified(client, url) for url in (reviews_url, comments_url)}
+
+        response = auth_client(moderator).patch('/api/v1/users/me/', data={'username': 'renamed'})
+        assert response.status_code == 200, (
+            'Проверьте, что пользователь может изменить своё имя'
+        )
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что при изменении имени автора меняется `ETag` ответа `{url}`'
+            )
+            authors = {item['author'] for item in response.json()['results']}
+            assert 'renamed' in authors and moderator.username not in authors, (
+                f'Проверьте, что ответ `{url}` содержит новое имя автора'
+            )
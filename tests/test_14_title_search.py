@@ -0,0 +1,42 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test14TitleSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?search=поворот')
+        data = response.json()
+        assert response.status_code == 200 and data['count'] == 1, (
+            'Проверьте, что при GET запросе `/api/v1/titles/?search=` произведения ищутся по названию'
+        )
+        assert data['results'][0]['id'] == titles[0]['id'], (
+            'Проверьте, что при GET запросе `/api/v1/titles/?search=` возвращаются найденные произведения'
+        )
+        response = client.get('/api/v1/titles/?search=драм')
+        assert [title['id'] for title in response.json()['results']] == [titles[1]['id']], (
+            'Проверьте, что при GET запросе `/api/v1/titles/?search=` произведения ищутся '
+            'по началу слова в описании'
+        )
+        response = client.get('/api/v1/titles/?search="пике*(')
+        assert response.status_code == 200 and response.json()['count'] == 1, (
+            'Проверьте, что спецсимволы в параметре `search` не ломают запрос'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_follows_changes_and_ranks(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Проект поворот поворот'})
+        response = client.get('/api/v1/titles/?search=поворот')
+        assert [title['id'] for title in response.json()['results']] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что результаты поиска `/api/v1/titles/?search=` упорядочены по релевантности '
+            'и учитывают изменения произведений'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        response = client.get('/api/v1/titles/?search=проект')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что удаленные произведения не находятся поиском'
+        )
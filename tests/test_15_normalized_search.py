@@ -0,0 +1,67 @@
+import pytest
+
+from .common import create_categories, create_genre, create_titles
+
+
+class Test15NormalizedSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_category_genre_search_case_insensitive(self, client, admin_client):
+        create_categories(admin_client)
+        create_genre(admin_client)
+        admin_client.post('/api/v1/genres/', data={'name': 'Ёлочные  Истории', 'slug': 'tree'})
+        response = client.get('/api/v1/categories/?search=КНИ')
+        assert [item['slug'] for item in response.json()['results']] == ['books'], (
+            'Проверьте, что поиск `/api/v1/categories/?search=` не зависит от регистра кириллицы'
+        )
+        response = client.get('/api/v1/genres/?search=елочные истории')
+        assert [item['slug'] for item in response.json()['results']] == ['tree'], (
+            'Проверьте, что поиск `/api/v1/genres/?search=` не различает `ё` и `е` и лишние пробелы'
+        )
+        response = client.get('/api/v1/genres/?search=')
+        assert response.json()['count'] == 4, (
+            'Проверьте, что пустой параметр `search` не фильтрует жанры'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_name_case_insensitive(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/?name=поворот ТУДА')
+        assert [item['id'] for item in response.json()['results']] == [titles[0]['id']], (
+            'Проверьте, что фильтр `/api/v1/titles/?name=` не зависит от регистра кириллицы'
+        )
+        admin_client.patch(f'/api/v1/titles/{titles[1]["id"]}/', data={'name': 'Поворот обратно'})
+        response = client.get('/api/v1/titles/?name=ПОВОРОТ')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что фильтр `/api/v1/titles/?name=` учитывает изменения названия'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_search_uses_index(self):
+        from django.db import connection
+        from reviews.models import Genre
+        from reviews.search import prefix_lookup
+
+        queryset = Genre.objects.filter(**prefix_lookup('search_name', 'Дра'))
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        assert 'search_name' in plan and 'SEARCH' in plan, (
+            f'Проверьте, что поиск по названию использует индекс: {plan}'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_search_last_code_point(self, client, admin_client):
+        last = chr(0x10FFFF)
+        for name, slug in ((f'Драма{last}', 'drama'), (f'{last}Драма', 'drama-2'), ('Дрб', 'drb')):
+            admin_client.post('/api/v1/genres/', data={'name': name, 'slug': slug})
+        for url, value, term, count in (
+            ('/api/v1/genres/', 'search', f'Драма{last}', 1),
+            ('/api/v1/genres/', 'search', last, 1),
+            ('/api/v1/titles/', 'name', last, 0),
+        ):
+            response = client.get(url, {value: term})
+            assert response.status_code == 200 and response.json()['count'] == count, (
+                f'Проверьте, что поиск `{url}?{value}=` принимает последний символ Unicode'
+            )
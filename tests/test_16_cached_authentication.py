@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .common import create_reviews
+
+
+def token_client(user):
+    from api.views import get_access_token
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)["token"]}')
+    return client
+
+
+def users_queries(context):
+    return [query['sql'] for query in context.captured_queries if 'users_user' in query['sql']]
+
+
+class Test16CachedAuthentication:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_read_without_users_query(self, admin_client, admin):
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        client = token_client(user)
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == 200 and not users_queries(context), (
+            'Проверьте, что данные пользователя берутся из кэша пользователей'
+        )
+        response = client.get('/api/v1/users/me/')
+        assert response.json()['username'] == user.username, (
+            'Проверьте, что при GET запросе `/api/v1/users/me/` возвращаются данные пользователя'
+        )
+        response = client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'текст', 'score': 2})
+        assert response.status_code == 201 and response.json()['author'] == user.username, (
+            'Проверьте, что пользователь с токеном может оставить отзыв'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_admin_loaded_once(self, admin_client, admin):
+        client = token_client(admin)
+        client.get('/api/v1/users/')
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/api/v1/categories/')
+        assert response.status_code == 200 and not users_queries(context), (
+            'Проверьте, что данные администратора берутся из кэша пользователей'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_role_change_applies_to_old_tokens(self, admin_client, admin, user_superuser_client):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        old_admin_client = token_client(admin)
+        moderator_client = token_client(moderator)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/'
+        moderator_client.get(url)
+        assert old_admin_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что администратор получает список пользователей'
+        )
+
+        user_superuser_client.patch(f'/api/v1/users/{moderator.username}/', data={'role': 'user'})
+        user_superuser_client.patch(f'/api/v1/users/{admin.username}/', data={'role': 'user'})
+        assert moderator_client.patch(url, data={'text': 'изменено'}).status_code == 403, (
+            'Проверьте, что после смены роли модератор со старым токеном не может изменять чужие отзывы'
+        )
+        assert old_admin_client.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что после смены роли администратор со старым токеном не получает список пользователей'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_inactive_and_deleted_users(self, user):
+        client = token_client(user)
+        assert client.get('/api/v1/users/me/').status_code == 200, (
+            'Проверьте, что пользователь получает свои данные'
+        )
+        user.is_active = False
+        user.save()
+        assert client.get('/api/v1/categories/').status_code == 401, (
+            'Проверьте, что неактивный пользователь со старым токеном не проходит аутентификацию'
+        )
+        user.delete()
+        assert client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что удалённый пользователь со старым токеном не проходит аутентификацию'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_me_patch_keeps_fresh_role(self, user):
+        from users.models import User
+
+        client = token_client(user)
+        client.get('/api/v1/users/me/')
+        # Role changed by another process, the cached row is stale.
+        User.objects.filter(pk=user.pk).update(role='moderator')
+        response = client.patch('/api/v1/users/me/', data={'bio': 'О себе'})
+        assert response.status_code == 200 and response.json()['role'] == 'moderator', (
+            'Проверьте, что изменение своих данных не возвращает устаревшую роль'
+        )
+        assert User.objects.get(pk=user.pk).role == 'moderator', (
+            'Проверьте, что изменение своих данных не перезаписывает роль, назначенную администратором'
+        )
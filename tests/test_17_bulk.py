@@ -0,0 +1,158 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_categories, create_genre, create_titles
+
+
+class Test17Bulk:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_genres_and_categories(self, client, admin_client):
+        create_genre(admin_client)
+        data = [
+            {'name': 'Страшное', 'slug': 'horror'},
+            {'name': 'Фэнтези', 'slug': 'fantasy'},
+            {'name': 'Без слага'},
+            {'name': 'Фэнтези 2', 'slug': 'fantasy'},
+        ]
+        response = admin_client.post('/api/v1/genres/bulk/', data=data, format='json')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/genres/bulk/` возвращает статус 200'
+        )
+        statuses = [item['status'] for item in response.json()]
+        assert statuses == [200, 201, 400, 400], (
+            'Проверьте, что `/api/v1/genres/bulk/` возвращает результат для каждого элемента по порядку'
+        )
+        response = client.get('/api/v1/genres/')
+        genres = {item['slug']: item['name'] for item in response.json()['results']}
+        assert genres['horror'] == 'Страшное' and genres['fantasy'] == 'Фэнтези', (
+            'Проверьте, что `/api/v1/genres/bulk/` создаёт новые и обновляет существующие жанры'
+        )
+        assert len(genres) == 4, (
+            'Проверьте, что ошибочные элементы не сохраняются'
+        )
+        response = admin_client.post(
+            '/api/v1/categories/bulk/', data=[{'name': 'Музыка', 'slug': 'music'}], format='json'
+        )
+        assert response.json() == [{'slug': 'music', 'status': 201}], (
+            'Проверьте, что `/api/v1/categories/bulk/` создаёт категории'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_titles(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = [
+            {'name': 'Новое', 'year': 1999, 'category': 'films', 'genre': ['drama', 'comedy']},
+            {'id': titles[0]['id'], 'name': 'Поворот обратно', 'genre': ['drama']},
+            {'name': 'Без жанра', 'year': 1999, 'category': 'films', 'genre': ['unknown']},
+            {'name': 'Без категории', 'year': 1999, 'genre': ['drama']},
+            {'name': 'Проект', 'year': 2020, 'category': 'books', 'genre': ['drama']},
+            {'id': 100500, 'name': 'Нет такого'},
+            {'name': 'Из будущего', 'year': 3000, 'category': 'films', 'genre': ['drama']},
+        ]
+        response = admin_client.post('/api/v1/titles/bulk/', data=data, format='json')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/bulk/` возвращает статус 200'
+        )
+        results = response.json()
+        assert [item['status'] for item in results] == [201, 200, 400, 400, 400, 400, 400], (
+            'Проверьте, что `/api/v1/titles/bulk/` возвращает результат для каждого элемента по порядку'
+        )
+        assert 'genre' in results[2]['errors'] and 'category' in results[3]['errors'], (
+            'Проверьте, что для ошибочных элементов возвращаются ошибки полей'
+        )
+        assert results[1]['id'] == titles[0]['id'], (
+            'Проверьте, что для обновлённого произведения возвращается его id'
+        )
+
+        response = client.get(f'/api/v1/titles/{results[0]["id"]}/')
+        new_title = response.json()
+        assert new_title['name'] == 'Новое' and new_title['category']['slug'] == 'films', (
+            'Проверьте, что `/api/v1/titles/bulk/` создаёт произведения'
+        )
+        assert sorted(genre['slug'] for genre in new_title['genre']) == ['comedy', 'drama'], (
+            'Проверьте, что `/api/v1/titles/bulk/` сохраняет жанры новых произведений'
+        )
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        updated = response.json()
+        assert updated['name'] == 'Поворот обратно' and updated['year'] == 2000, (
+            'Проверьте, что `/api/v1/titles/bulk/` обновляет только переданные поля'
+        )
+        assert [genre['slug'] for genre in updated['genre']] == ['drama'], (
+            'Проверьте, что `/api/v1/titles/bulk/` заменяет жанры обновлённых произведений'
+        )
+        response = client.get('/api/v1/titles/?name=поворот обратно')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после массового обновления работает фильтр по названию'
+        )
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что ошибочные элементы не сохраняются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_permissions_and_body(self, client, user_client, moderator_client, admin_client):
+        data = [{'name': 'Фэнтези', 'slug': 'fantasy'}]
+        for url in ('/api/v1/genres/bulk/', '/api/v1/categories/bulk/', '/api/v1/titles/bulk/'):
+            response = client.post(url, data=data, content_type='application/json')
+            assert response.status_code == 401, (
+                f'Проверьте, что `{url}` недоступен анонимному пользователю'
+            )
+            for role_client in (user_client, moderator_client):
+                response = role_client.post(url, data=data, format='json')
+                assert response.status_code == 403, (
+                    f'Проверьте, что `{url}` доступен только администратору'
+                )
+        response = admin_client.post('/api/v1/genres/bulk/', data=data[0], format='json')
+        assert response.status_code == 400, (
+            'Проверьте, что `/api/v1/genres/bulk/` принимает только список'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_bulk_query_count(self, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+
+        def count_queries(size, offset):
+            data = [
+                {'name': f'Произведение {offset + index}', 'year': 2000,
+                 'category': 'books', 'genre': ['drama', 'horror']}
+                for index in range(size)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post('/api/v1/titles/bulk/', data=data, format='json')
+            assert all(item['status'] == 201 for item in response.json())
+            return len(context.captured_queries)
+
+        assert count_queries(5, 0) == count_queries(40, 5), (
+            'Проверьте, что число запросов `/api/v1/titles/bulk/` не зависит от числа элементов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_bulk_rename_changes_titles(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        urls = [f'/api/v1/titles/{title["id"]}/' for title in titles]
+        etags = [client.get(url)['ETag'] for url in urls]
+        admin_client.post(
+            '/api/v1/categories/bulk/',
+            data=[{'name': 'Кино', 'slug': categories[0]['slug']}], format='json'
+        )
+        response = client.get(urls[0], HTTP_IF_NONE_MATCH=etags[0])
+        assert response.status_code == 200 and response.json()['category']['name'] == 'Кино', (
+            'Проверьте, что переименование категории через bulk меняет ETag её произведений'
+        )
+        assert client.get(urls[1], HTTP_IF_NONE_MATCH=etags[1]).status_code == 304, (
+            'Проверьте, что переименование категории не меняет ETag других произведений'
+        )
+        etag = response['ETag']
+        admin_client.post(
+            '/api/v1/genres/bulk/',
+            data=[{'name': 'Новый жанр', 'slug': genres[0]['slug']}], format='json'
+        )
+        response = client.get(urls[0], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and 'Новый жанр' in [
+            genre['name'] for genre in response.json()['genre']
+        ], (
+            'Проверьте, что переименование жанра через bulk меняет ETag его произведений'
+        )
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from .common import create_reviews
+
+
+def read_lines(response):
+    content = b''.join(response.streaming_content).decode('utf8')
+    return [json.loads(line) for line in content.splitlines()]
+
+
+class Test18Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_titles(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        response = admin_client.get('/api/v1/titles/export/')
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/export/` доступен администратору'
+        )
+        assert response.streaming and response['Content-Type'].startswith('application/x-ndjson'), (
+            'Проверьте, что `/api/v1/titles/export/` отдаёт потоковый ответ в формате NDJSON'
+        )
+        exported = read_lines(response)
+        for title in titles:
+            detail = client.get(f'/api/v1/titles/{title["id"]}/').json()
+            assert detail in exported, (
+                'Проверьте, что `/api/v1/titles/export/` отдаёт произведения в формате `/api/v1/titles/{id}/`'
+            )
+        assert len(exported) == len(titles), (
+            'Проверьте, что `/api/v1/titles/export/` отдаёт каждое произведение один раз'
+        )
+
+        response = admin_client.get('/api/v1/titles/export/?reviews=1&year=2000')
+        exported = read_lines(response)
+        assert [title['id'] for title in exported] == [titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/export/` учитывает фильтры списка произведений'
+        )
+        assert sorted(review['id'] for review in exported[0]['reviews']) == sorted(
+            review['id'] for review in reviews
+        ), (
+            'Проверьте, что `/api/v1/titles/export/?reviews=1` добавляет отзывы произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_chunks(self, admin_client, admin, django_assert_num_queries):
+        from api.export import export_titles
+        from reviews.models import Title
+
+        create_reviews(admin_client, admin)
+        with django_assert_num_queries(3):
+            chunks = list(export_titles(Title.objects.all(), chunk_size=1))
+        assert len(chunks) == 2, (
+            'Проверьте, что экспорт читает произведения частями'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_permissions(self, client, user_client, moderator_client):
+        response = client.get('/api/v1/titles/export/')
+        assert response.status_code == 401, (
+            'Проверьте, что `/api/v1/titles/export/` недоступен анонимному пользователю'
+        )
+        for role_client in (user_client, moderator_client):
+            response = role_client.get('/api/v1/titles/export/')
+            assert response.status_code == 403, (
+                'Проверьте, что `/api/v1/titles/export/` доступен только администратору'
+            )
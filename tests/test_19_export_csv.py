@@ -0,0 +1,54 @@
+import gzip
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from .common import create_comments
+
+FILENAMES = ('category', 'genre', 'titles', 'genre_title', 'users', 'review', 'comments')
+
+
+class Test19ExportCsv:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_import_round_trip(self, admin_client, admin, tmp_path):
+        from reviews.models import Category, Genre, Title
+        from users.models import User
+
+        create_comments(admin_client, admin)
+        rating = Title.objects.values_list('pk', 'rating').order_by('pk')
+        ratings = list(rating)
+        first, second = tmp_path / 'first', tmp_path / 'second'
+        call_command('export_csv', data_dir=str(first))
+        for name in FILENAMES:
+            assert (first / f'{name}.csv').exists(), (
+                f'Проверьте, что команда `export_csv` создаёт файл {name}.csv'
+            )
+        with open(first / 'titles.csv', encoding='utf8') as csv_file:
+            assert csv_file.readline().startswith('id,name,year,category'), (
+                'Проверьте, что `export_csv` пишет файлы в формате `static/data`'
+            )
+
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+        User.objects.all().delete()
+        call_command('import_csv', data_dir=str(first))
+        assert list(rating) == ratings, (
+            'Проверьте, что `import_csv` загружает файлы, созданные `export_csv`'
+        )
+
+        call_command('export_csv', data_dir=str(second), gzip=True, jobs=4)
+        for name in FILENAMES:
+            with gzip.open(second / f'{name}.csv.gz', 'rt', encoding='utf8') as compressed:
+                with open(first / f'{name}.csv', encoding='utf8') as plain:
+                    assert compressed.read() == plain.read(), (
+                        f'Проверьте, что выгрузка {name} совпадает после загрузки и повторной выгрузки'
+                    )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_does_not_overwrite(self, tmp_path):
+        call_command('export_csv', data_dir=str(tmp_path))
+        with pytest.raises(CommandError):
+            call_command('export_csv', data_dir=str(tmp_path))
+        call_command('export_csv', data_dir=str(tmp_path), overwrite=True)
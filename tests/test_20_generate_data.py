@@ -0,0 +1,91 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Sum
+
+
+def generate(**options):
+    call_command(
+        'generate_data', users=50, categories=3, genres=5, titles=20,
+        reviews=300, comments=100, **options
+    )
+
+
+class Test20GenerateData:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_generate_data(self, client):
+        from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+        from users.models import User
+
+        generate()
+        assert (
+            User.objects.count(), Category.objects.count(), Genre.objects.count(),
+            Title.objects.count(), Review.objects.count(), Comment.objects.count()
+        ) == (50, 3, 5, 20, 300, 100), (
+            'Проверьте, что команда `generate_data` создаёт заданное число объектов'
+        )
+        assert not GenreTitle.objects.values('title').annotate(
+            genres=Count('genre')
+        ).filter(genres=0).exists() and GenreTitle.objects.count() >= 20, (
+            'Проверьте, что `generate_data` связывает произведения с жанрами'
+        )
+        counts = list(Title.objects.order_by('-rating_count').values_list('rating_count', flat=True))
+        assert counts[0] >= 3 * counts[len(counts) // 2], (
+            'Проверьте, что отзывы распределены неравномерно: у популярных произведений больше отзывов'
+        )
+        for title in Title.objects.annotate(total=Sum('reviews__score'), reviews_count=Count('reviews')):
+            assert (title.rating_sum, title.rating_count) == (title.total or 0, title.reviews_count), (
+                'Проверьте, что `generate_data` сохраняет рейтинг произведений'
+            )
+        title = Title.objects.order_by('-rating_count').first()
+        response = client.get(f'/api/v1/titles/?name={title.name.upper()}')
+        assert title.id in [item['id'] for item in response.json()['results']], (
+            'Проверьте, что для созданных произведений работает поиск по названию'
+        )
+        review = Review.objects.filter(title=title).first()
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/{review.id}/')
+        assert response.status_code == 200 and response.json()['pub_date'], (
+            'Проверьте, что созданные отзывы доступны через API'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_generate_data_deterministic(self):
+        from reviews.models import Category, Genre, Review, Title
+        from users.models import User
+
+        def snapshot():
+            return (
+                list(Title.objects.order_by('pk').values_list('pk', 'name', 'year', 'category_id')),
+                list(Review.objects.order_by('pk').values_list('pk', 'title_id', 'author_id', 'score')),
+            )
+
+        generate(seed=7)
+        first = snapshot()
+        for model in (Title, Category, Genre, User):
+            model.objects.all().delete()
+        generate(seed=7)
+        assert snapshot() == first, (
+            'Проверьте, что `generate_data` с одинаковым `--seed` создаёт одинаковые данные'
+        )
+        generate(seed=7)
+        assert Title.objects.count() == 40 and Review.objects.count() == 600, (
+            'Проверьте, что `generate_data` добавляет данные к существующим, не нарушая уникальность'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_generate_data_unique_reviews(self):
+        from django.core.management import CommandError
+
+        with pytest.raises(CommandError):
+            call_command('generate_data', users=2, titles=2, reviews=5)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_generate_data_few_genres(self):
+        from reviews.models import GenreTitle, Title
+
+        call_command(
+            'generate_data', users=5, categories=1, genres=1, titles=10, reviews=10
+        )
+        assert Title.objects.count() == 10 and GenreTitle.objects.count() == 10, (
+            'Проверьте, что `generate_data` работает, когда жанров меньше трёх'
+        )
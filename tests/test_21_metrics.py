@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from .common import create_reviews
+
+
+def get_value(metrics, line_start):
+    for line in metrics.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class Test21Metrics:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_server_timing(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        header = response.get('Server-Timing', '')
+        match = re.fullmatch(
+            r'total;dur=([\d.]+), db;dur=([\d.]+);desc="(\d+) queries", serializer;dur=([\d.]+)',
+            header
+        )
+        assert match, (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` со временем запроса, БД и сериализатора'
+        )
+        total, db, queries, serializer = map(float, match.groups())
+        assert queries > 0 and 0 < db <= total and 0 < serializer <= total, (
+            'Проверьте, что `Server-Timing` учитывает запросы к БД и время сериализатора'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_metrics_endpoint(self, client, admin_client):
+        from api.metrics import registry
+
+        registry.clear()
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/genres/')
+        admin_client.post('/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'})
+        response = admin_client.get('/metrics/')
+        assert response.status_code == 200 and response['Content-Type'].startswith('text/plain'), (
+            'Проверьте, что `/metrics/` доступен администратору в текстовом формате'
+        )
+        metrics = response.content.decode()
+        assert get_value(metrics, 'api_request_duration_seconds_count{view="TitleViewSet.list"}') == 2, (
+            'Проверьте, что `/metrics/` считает запросы по представлению и действию'
+        )
+        assert get_value(metrics, 'api_requests_total{view="GenreViewSet.create",status="201"}') == 1, (
+            'Проверьте, что `/metrics/` считает запросы по статусу ответа'
+        )
+        assert get_value(
+            metrics, 'api_db_queries_bucket{view="GenreViewSet.list",le="+Inf"}'
+        ) == 1, (
+            'Проверьте, что `/metrics/` содержит гистограмму числа запросов к БД'
+        )
+        assert get_value(metrics, 'api_serializer_duration_seconds_count{view="GenreViewSet.list"}') == 1, (
+            'Проверьте, что `/metrics/` содержит гистограмму времени сериализатора'
+        )
+        assert get_value(metrics, 'api_cache_hits_total') == 1, (
+            'Проверьте, что `/metrics/` содержит статистику кэша ответов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_metrics_permissions(self, client, user_client, moderator_client):
+        assert client.get('/metrics/').status_code == 401, (
+            'Проверьте, что `/metrics/` недоступен анонимному пользователю'
+        )
+        for role_client in (user_client, moderator_client):
+            assert role_client.get('/metrics/').status_code == 403, (
+                'Проверьте, что `/metrics/` доступен только администратору'
+            )
@@ -0,0 +1,97 @@
+import logging
+
+import pytest
+from django.test import override_settings
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def slow_queries(monkeypatch):
+    from api.slow_queries import logger
+
+    handler = ListHandler()
+    monkeypatch.setattr(logger, 'handlers', [handler])
+    return handler.messages
+
+
+class Test22SlowQueries:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_slow_query_log(self, client, admin_client, slow_queries):
+        admin_client.post('/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'})
+        slow_queries.clear()
+        with override_settings(SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_SAMPLE_RATE=1):
+            client.get('/api/v1/titles/?genre=drama')
+        assert slow_queries and all(
+            'view=TitleViewSet.list' in message for message in slow_queries
+        ), (
+            'Проверьте, что медленные запросы записываются в журнал с представлением и действием'
+        )
+        count = [message for message in slow_queries if 'SELECT COUNT(*)' in message]
+        assert count and 'rest_framework/pagination.py' in count[0], (
+            'Проверьте, что журнал медленных запросов указывает место вызова запроса'
+        )
+        assert any(
+            'django_filters' in message and "params: ('drama',)" in message
+            for message in slow_queries
+        ), (
+            'Проверьте, что журнал медленных запросов содержит параметры запроса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_threshold_and_sampling(self, client, slow_queries):
+        with override_settings(SLOW_QUERY_THRESHOLD=10 ** 6, SLOW_QUERY_SAMPLE_RATE=1):
+            client.get('/api/v1/titles/')
+        with override_settings(SLOW_QUERY_THRESHOLD=0, SLOW_QUERY_SAMPLE_RATE=0):
+            client.get('/api/v1/titles/')
+        assert not slow_queries, (
+            'Проверьте, что в журнал попадают только запросы медленнее порога с учётом доли выборки'
+        )
+
+    def test_03_queue_file_handler(self, tmp_path):
+        from api.logs import QueueFileHandler
+
+        filename = tmp_path / 'logs' / 'slow.log'
+        handler = QueueFileHandler(str(filename), maxBytes=200, backupCount=2)
+        logger = logging.getLogger('tests.slow_queries')
+        logger.addHandler(handler)
+        try:
+            for number in range(20):
+                logger.warning('query %d %s', number, 'x' * 50)
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+        files = sorted(path.name for path in filename.parent.iterdir())
+        assert files == ['slow.log', 'slow.log.1', 'slow.log.2'], (
+            'Проверьте, что журнал медленных запросов пишется в ротируемый файл'
+        )
+        assert 'query 19' in filename.read_text(), (
+            'Проверьте, что все записи журнала сохраняются при закрытии обработчика'
+        )
+
+    def test_04_threshold_from_environment(self):
+        import os
+        import subprocess
+        import sys
+
+        from django.conf import settings
+
+        for value, expected in (('', 'None'), ('off', 'None'), ('None', 'None'), ('50', '50.0')):
+            result = subprocess.run(
+                [sys.executable, '-c',
+                 'from api_yamdb import settings; print(settings.SLOW_QUERY_THRESHOLD)'],
+                cwd=settings.BASE_DIR, env={**os.environ, 'SLOW_QUERY_THRESHOLD': value},
+                capture_output=True, text=True
+            )
+            assert result.stdout.strip() == expected, (
+                f'Проверьте, что `SLOW_QUERY_THRESHOLD={value}` задаёт порог {expected}: {result.stderr}'
+            )
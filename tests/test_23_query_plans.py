@@ -0,0 +1,107 @@
+import re
+
+import pytest
+from django.core.management import call_command
+
+# SQLite before 3.36 prints 'SCAN TABLE name', newer versions 'SCAN name'.
+SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)( USING .*INDEX .*)?$')
+TABLE_STEP = re.compile(r'^(?:SCAN|SEARCH) (?:TABLE )?(\w+)')
+
+
+def full_scans(sql, params):
+    """
+    Tables read completely by the query. Walking an index is allowed only
+    for queries without conditions: ordered pages and total counts.
+    """
+    from django.db import connection
+
+    tables = set(connection.introspection.table_names())
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        plan = [row[-1] for row in cursor.fetchall()]
+    assert any(
+        match and match.group(1) in tables
+        for match in map(TABLE_STEP.match, plan)
+    ), (
+        f'Формат плана запроса не распознан, проверьте выражения теста: {plan}'
+    )
+    scans = []
+    for step in plan:
+        match = SCAN.match(step)
+        if not match or match.group(1) not in tables:
+            continue
+        if match.group(2) is None or ' WHERE ' in sql:
+            scans.append(step)
+    return scans
+
+
+def get_queries(client, url):
+    from django.db import connection
+
+    queries = []
+
+    def collect(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(collect):
+        response = client.get(url)
+    assert response.status_code == 200, f'Ответ `{url}` должен иметь статус 200'
+    return [(sql, params) for sql, params in queries if sql.startswith('SELECT')]
+
+
+class Test23QueryPlans:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_list_endpoints_without_full_scans(self, admin_client):
+        from reviews.models import Category, Genre, Title
+
+        call_command(
+            'generate_data', users=20, categories=3, genres=5, titles=50,
+            reviews=200, comments=100
+        )
+        title = Title.objects.order_by('-rating_count').first()
+        review = title.reviews.first()
+        category = Category.objects.first()
+        genre = Genre.objects.first()
+        titles_year = Title.objects.filter(category=category).first().year
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/?year={titles_year}',
+            f'/api/v1/titles/?category={category.slug}',
+            f'/api/v1/titles/?year={titles_year}&category={category.slug}',
+            f'/api/v1/titles/?genre={genre.slug}',
+            f'/api/v1/titles/?name={title.name[:2]}',
+            f'/api/v1/titles/?search={title.name.split()[0]}',
+            '/api/v1/titles/top/',
+            f'/api/v1/titles/top/?year={titles_year}',
+            f'/api/v1/titles/top/?category={category.slug}',
+            f'/api/v1/titles/top/?genre={genre.slug}',
+            '/api/v1/categories/',
+            f'/api/v1/categories/?search={category.name[:2]}',
+            '/api/v1/genres/',
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/?cursor=',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/?cursor=',
+            '/api/v1/users/',
+        )
+        for url in urls:
+            for sql, params in get_queries(admin_client, url):
+                scans = full_scans(sql, params)
+                assert not scans, (
+                    f'Проверьте, что запросы `{url}` используют индексы, '
+                    f'а не читают таблицу целиком: {scans} в {sql}'
+                )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_full_scan_detected(self):
+        assert full_scans(
+            'SELECT "id" FROM "reviews_title" WHERE "description" = %s', ('x',)
+        ), (
+            'Проверьте, что тест находит чтение таблицы целиком'
+        )
+        for step in ('SCAN reviews_title', 'SCAN TABLE reviews_title'):
+            assert SCAN.match(step).groups() == ('reviews_title', None), (
+                f'Проверьте, что тест распознаёт формат плана `{step}`'
+            )
@@ -0,0 +1,82 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+def histogram(**counts):
+    return {str(score): counts.get(f's{score}', 0) for score in range(1, 11)}
+
+
+class Test24ScoreHistogram:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_histogram_maintained(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/score_histogram/'
+        response = client.get(url)
+        assert response.status_code == 200, (
+            'Проверьте, что `/api/v1/titles/{title_id}/score_histogram/` доступен без токена'
+        )
+        assert response.json() == {
+            'id': titles[0]['id'], 'rating_count': 3, 'score_histogram': histogram(s3=1, s4=1, s5=1)
+        }, (
+            'Проверьте, что при создании отзыва увеличивается счётчик его оценки'
+        )
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/', data={'score': 5}
+        )
+        assert client.get(url).json()['score_histogram'] == histogram(s4=1, s5=2), (
+            'Проверьте, что при изменении оценки отзыва обновляются счётчики оценок'
+        )
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[2]["id"]}/')
+        assert client.get(url).json()['score_histogram'] == histogram(s5=2), (
+            'Проверьте, что при удалении отзыва уменьшается счётчик его оценки'
+        )
+        assert client.get('/api/v1/titles/0/score_histogram/').status_code == 404, (
+            'Проверьте, что для несуществующего произведения возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_opt_in_field(self, client, admin_client, admin, django_assert_num_queries):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert 'score_histogram' not in title, (
+            'Проверьте, что поле `score_histogram` выводится только по запросу'
+        )
+        title = client.get(f'/api/v1/titles/{titles[0]["id"]}/?score_histogram=1').json()
+        assert title['score_histogram'] == histogram(s3=1, s4=1, s5=1), (
+            'Проверьте, что `?score_histogram=1` добавляет поле `score_histogram` к произведению'
+        )
+        response = client.get('/api/v1/titles/')
+        with django_assert_num_queries(3):
+            results = client.get('/api/v1/titles/?score_histogram=true').json()['results']
+        assert all('score_histogram' not in result for result in response.json()['results']) and {
+            result['id']: result['score_histogram'] for result in results
+        }[titles[0]['id']] == histogram(s3=1, s4=1, s5=1), (
+            'Проверьте, что список произведений выводит `score_histogram` без дополнительных запросов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_recalculate_histogram(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        from reviews.models import SCORE_FIELDS, Title
+
+        Title.objects.update(**{field: 7 for field in SCORE_FIELDS})
+        call_command('recalculate_ratings')
+        assert Title.objects.get(pk=titles[0]['id']).score_histogram == {
+            int(score): count for score, count in histogram(s3=1, s4=1, s5=1).items()
+        }, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает счётчики оценок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_generated_histogram(self):
+        from reviews.models import SCORE_FIELDS, Title
+
+        call_command('generate_data', users=20, titles=10, reviews=100, comments=0)
+        generated = list(Title.objects.order_by('pk').values_list(*SCORE_FIELDS))
+        call_command('recalculate_ratings')
+        assert list(Title.objects.order_by('pk').values_list(*SCORE_FIELDS)) == generated, (
+            'Проверьте, что `generate_data` заполняет счётчики оценок произведений'
+        )
@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+def top_ids(client, query=''):
+    response = client.get(f'/api/v1/titles/top/{query}')
+    assert response.status_code == 200, (
+        'Проверьте, что `/api/v1/titles/top/` доступен без токена'
+    )
+    return [title['id'] for title in response.json()]
+
+
+class Test25TopTitles:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top_titles(self, client, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        admin_client.post(
+            '/api/v1/titles/',
+            data={'name': 'Без отзывов', 'year': 2000, 'genre': [titles[0]['genre'][0]],
+                  'category': titles[0]['category']}
+        )
+        for author_client, score in ((admin_client, 10), (auth_client(user), 10)):
+            author_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'Шедевр', 'score': score})
+
+        response = client.get('/api/v1/titles/top/')
+        data = response.json()
+        assert [title['id'] for title in data] == [titles[1]['id'], titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/top/` упорядочен по взвешенному рейтингу '
+            'и не содержит произведений без отзывов'
+        )
+        assert [title['weighted_rating'] for title in data] == [6.25, 5.15], (
+            'Проверьте, что взвешенный рейтинг учитывает априорную оценку 5.5 с весом 10 отзывов'
+        )
+        assert {'id', 'name', 'year', 'rating', 'genre', 'category'} <= set(data[0]), (
+            'Проверьте, что `/api/v1/titles/top/` возвращает поля произведения'
+        )
+        assert top_ids(client, '?limit=1') == [titles[1]['id']], (
+            'Проверьте, что параметр `limit` ограничивает число произведений'
+        )
+        assert top_ids(client, '?year=2000') == [titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/top/` фильтруется по году'
+        )
+        assert top_ids(client, f'?category={titles[1]["category"]}') == [titles[1]['id']], (
+            'Проверьте, что `/api/v1/titles/top/` фильтруется по категории'
+        )
+        assert top_ids(client, f'?genre={titles[0]["genre"][0]}') == [titles[0]['id']], (
+            'Проверьте, что `/api/v1/titles/top/` фильтруется по жанру'
+        )
+        for limit in ('0', '101', 'many'):
+            response = client.get(f'/api/v1/titles/top/?limit={limit}')
+            assert response.status_code == 400 and 'limit' in response.json(), (
+                'Проверьте, что неверный `limit` возвращает статус 400'
+            )
+
+        for review in reviews:
+            admin_client.patch(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/', data={'score': 10}
+            )
+        assert top_ids(client) == [titles[0]['id'], titles[1]['id']], (
+            'Проверьте, что рейтинг `/api/v1/titles/top/` обновляется при изменении отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_recalculate_weighted_rating(self, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        from reviews.models import Title
+
+        stored = dict(Title.objects.values_list('pk', 'weighted_rating'))
+        Title.objects.update(weighted_rating=1)
+        call_command('recalculate_ratings')
+        assert dict(Title.objects.values_list('pk', 'weighted_rating')) == stored, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает взвешенный рейтинг'
+        )
+        assert stored[titles[1]['id']] is None, (
+            'Проверьте, что у произведения без отзывов нет взвешенного рейтинга'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_generated_weighted_rating(self):
+        from reviews.models import Title
+
+        call_command('generate_data', users=20, titles=10, reviews=100, comments=0)
+        generated = list(Title.objects.order_by('pk').values_list('weighted_rating', flat=True))
+        call_command('recalculate_ratings')
+        recalculated = Title.objects.order_by('pk').values_list('weighted_rating', flat=True)
+        assert all(
+            (a is None and b is None) or abs(a - b) < 1e-9
+            for a, b in zip(generated, recalculated)
+        ), (
+            'Проверьте, что `generate_data` заполняет взвешенный рейтинг произведений'
+        )
@@ -0,0 +1,77 @@
+import pytest
+from django.core.management import call_command
+
+
+def get_plan(sql, params):
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def get_titles(client, query):
+    response = client.get(f'/api/v1/titles/?{query}')
+    assert response.status_code == 200, (
+        f'Проверьте, что `/api/v1/titles/?{query}` возвращает статус 200'
+    )
+    return response.json()['results']
+
+
+class Test26TitleOrdering:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_ordering(self, client, monkeypatch):
+        from rest_framework.pagination import PageNumberPagination
+        from reviews.models import Title
+
+        monkeypatch.setattr(PageNumberPagination, 'page_size', 100)
+        call_command('generate_data', users=20, titles=40, reviews=200, comments=0)
+        titles = list(Title.objects.all())
+
+        def expected(key, reverse=False):
+            return [title.id for title in sorted(titles, key=key, reverse=reverse)]
+
+        def rating(title):
+            return (title.rating is not None, title.rating or 0, title.id)
+
+        cases = (
+            ('rating', expected(rating)),
+            ('-rating', expected(rating, reverse=True)),
+            ('year', expected(lambda title: (title.year, title.name, title.id))),
+            ('-year', expected(lambda title: (title.year, title.name, title.id), reverse=True)),
+            ('name', expected(lambda title: title.name)),
+        )
+        for ordering, ids in cases:
+            results = get_titles(client, f'ordering={ordering}')
+            assert [title['id'] for title in results] == ids, (
+                f'Проверьте, что `ordering={ordering}` упорядочивает произведения'
+            )
+        results = get_titles(client, 'ordering=description')
+        assert [title['id'] for title in results] == expected(lambda title: title.name), (
+            'Проверьте, что сортировка по другим полям игнорируется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_ordering_uses_index(self, client):
+        from django.db import connection
+
+        call_command('generate_data', users=20, titles=40, reviews=200, comments=0)
+        for ordering in ('rating', '-rating', 'year', '-year', 'name'):
+            queries = []
+
+            def collect(execute, sql, params, many, context):
+                queries.append((sql, params))
+                return execute(sql, params, many, context)
+
+            with connection.execute_wrapper(collect):
+                client.get(f'/api/v1/titles/?ordering={ordering}')
+            sql, params = next(
+                (sql, params) for sql, params in queries
+                if sql.startswith('SELECT') and 'ORDER BY' in sql and 'LIMIT' in sql
+            )
+            plan = get_plan(sql, params)
+            assert not any('TEMP B-TREE' in step for step in plan), (
+                f'Проверьте, что `ordering={ordering}` читает индекс, а не сортирует '
+                f'все произведения: {plan}'
+            )
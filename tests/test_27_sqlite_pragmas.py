@@ -0,0 +1,73 @@
+import pytest
+from django.test import override_settings
+
+
+def open_database(path):
+    """New connection to the SQLite file with the project settings."""
+    from django.db import connection
+    from django.db.backends.sqlite3.base import DatabaseWrapper
+
+    wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': str(path)})
+    wrapper.ensure_connection()
+    return wrapper
+
+
+def pragma(wrapper, name):
+    return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+
+class Test27SqlitePragmas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pragmas_applied(self, tmp_path):
+        wrapper = open_database(tmp_path / 'db.sqlite3')
+        try:
+            assert (
+                pragma(wrapper, 'journal_mode'), pragma(wrapper, 'synchronous'),
+                pragma(wrapper, 'busy_timeout'), pragma(wrapper, 'cache_size'),
+                pragma(wrapper, 'mmap_size')
+            ) == ('wal', 1, 5000, -65536, 256 * 1024 * 1024), (
+                'Проверьте, что новое соединение с SQLite получает настройки из `SQLITE_PRAGMAS`'
+            )
+        finally:
+            wrapper.close()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_pragmas_configurable(self, tmp_path):
+        profile = {'busy_timeout': 100, 'journal_mode': 'delete', 'synchronous': 'full'}
+        with override_settings(SQLITE_PRAGMAS=profile):
+            wrapper = open_database(tmp_path / 'db.sqlite3')
+        try:
+            assert (
+                pragma(wrapper, 'busy_timeout'), pragma(wrapper, 'journal_mode'),
+                pragma(wrapper, 'synchronous')
+            ) == (100, 'delete', 2), (
+                'Проверьте, что настройки соединения с SQLite задаются в `SQLITE_PRAGMAS`'
+            )
+        finally:
+            wrapper.close()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_begin_immediate(self, tmp_path):
+        import sqlite3
+
+        path = tmp_path / 'db.sqlite3'
+        other = sqlite3.connect(str(path), timeout=0, isolation_level=None)
+        for begin_immediate in (False, True):
+            with override_settings(SQLITE_BEGIN_IMMEDIATE=begin_immediate):
+                wrapper = open_database(path)
+            try:
+                wrapper.cursor().execute('BEGIN')
+                try:
+                    other.execute('BEGIN IMMEDIATE')
+                    other.execute('ROLLBACK')
+                    locked = False
+                except sqlite3.OperationalError:
+                    locked = True
+                assert locked == begin_immediate, (
+                    'Проверьте, что при `SQLITE_BEGIN_IMMEDIATE` транзакция сразу '
+                    'получает блокировку записи'
+                )
+            finally:
+                wrapper.close()
+        other.close()
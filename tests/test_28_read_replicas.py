@@ -0,0 +1,104 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def replicate(tmp_path, settings):
+    """Second SQLite file as a replica, call the fixture to sync it."""
+    from django.db import connection, connections
+    from api.cache import invalidate
+
+    path = str(tmp_path / 'replica.sqlite3')
+    connections.databases['replica'] = {**connection.settings_dict, 'NAME': path}
+    settings.DATABASE_REPLICAS = ['replica']
+
+    def sync():
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+        invalidate()
+
+    sync()
+    yield sync
+    connections['replica'].close()
+    del connections['replica']
+    del connections.databases['replica']
+
+
+def get_count(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, f'Проверьте, что `{url}` возвращает статус 200'
+    return response.json()['count']
+
+
+class Test28ReadReplicas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reads_from_replica(self, client, user, user_client, replicate):
+        from reviews.models import Genre, Review, Title
+
+        title = Title.objects.create(name='Поворот туда', year=2000)
+        replicate()
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        Review.objects.create(title=title, author=user, text='Отзыв', score=5)
+        assert get_count(client, url) == 0, (
+            'Проверьте, что чтение из представлений API идёт с реплики'
+        )
+        replicate()
+        assert get_count(client, url) == 1, (
+            'Проверьте, что реплика отдаёт данные после синхронизации'
+        )
+
+        other = Title.objects.create(name='Проект', year=2020)
+        response = user_client.post(
+            f'/api/v1/titles/{other.id}/reviews/', data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что запросы на запись читают и пишут в основную базу'
+        )
+        assert (
+            Review.objects.using('default').count(), Review.objects.using('replica').count()
+        ) == (2, 1), (
+            'Проверьте, что запись идёт в основную базу'
+        )
+
+        Genre.objects.create(name='Драма', slug='drama')
+        for cache_status in ('MISS', 'HIT'):
+            response = client.get('/api/v1/genres/')
+            assert response['X-Cache'] == cache_status and response.json()['count'] == 1, (
+                'Проверьте, что общий кэш ответов заполняется из основной базы, а не с реплики'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_read_your_writes(self, client, admin_client, user_client, moderator_client,
+                                 replicate, settings):
+        from django.core.cache import caches
+
+        admin_client.post('/api/v1/categories/', data={'name': 'Фильмы', 'slug': 'films'})
+        response = admin_client.post(
+            '/api/v1/titles/', data={'name': 'Поворот туда', 'year': 2000, 'category': 'films'}
+        )
+        url = f'/api/v1/titles/{response.json()["id"]}/reviews/'
+        replicate()
+        user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert get_count(user_client, url) == 1, (
+            'Проверьте, что после записи автор читает из основной базы'
+        )
+        assert get_count(client, url) == 0 and get_count(moderator_client, url) == 0, (
+            'Проверьте, что остальные пользователи читают с реплики'
+        )
+        caches['api'].clear()
+        assert get_count(user_client, url) == 1, (
+            'Проверьте, что закрепление за основной базой хранится у клиента, '
+            'а не в кэше отдельного процесса'
+        )
+        settings.REPLICA_PIN_SECONDS = 0
+        assert get_count(user_client, url) == 0, (
+            'Проверьте, что чтение из основной базы закреплено за автором на время'
+        )
+        replicate()
+        assert get_count(client, url) == 1, (
+            'Проверьте, что реплика отдаёт данные после синхронизации'
+        )
@@ -0,0 +1,87 @@
+import pytest
+from django.core.management import call_command
+
+
+def render(data):
+    from rest_framework.renderers import JSONRenderer
+
+    return JSONRenderer().render(data)
+
+
+def assert_same(serializer_class, row_serializer_class, queryset, context=None):
+    context = context or {}
+    expected = serializer_class(queryset, many=True, context=context).data
+    rows = row_serializer_class(context=context).values(queryset)
+    data = row_serializer_class(rows, many=True, context=context).data
+    assert expected and render(data) == render(expected), (
+        f'Проверьте, что `{row_serializer_class.__name__}` возвращает то же, '
+        f'что и `{serializer_class.__name__}`'
+    )
+    row = row_serializer_class(context=context).values(queryset).first()
+    data = row_serializer_class(row, context=context).data
+    assert render(data) == render(expected[0]), (
+        f'Проверьте, что `{row_serializer_class.__name__}` сериализует одну строку'
+    )
+
+
+def count_queries(client, url):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200, f'Проверьте, что `{url}` возвращает статус 200'
+    return len(context)
+
+
+class Test29RowSerializers:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_same_output(self):
+        from api.row_serializers import (
+            CommentRowSerializer,
+            ReviewRowSerializer,
+            TitleRowSerializer,
+            TopTitleRowSerializer
+        )
+        from api.serializers import (
+            CommentSerializer,
+            ReviewSerializer,
+            TitleSerializer,
+            TopTitleSerializer
+        )
+        from reviews.models import Comment, Review, Title
+
+        call_command('generate_data', users=20, titles=30, reviews=150, comments=100)
+        Title.objects.create(name='Без категории', year=2000)
+        titles = Title.objects.select_related('category').prefetch_related('genre')
+        for context in ({}, {'score_histogram': True}):
+            assert_same(TitleSerializer, TitleRowSerializer, titles, context)
+        assert_same(
+            TopTitleSerializer, TopTitleRowSerializer,
+            titles.filter(weighted_rating__isnull=False).order_by('-weighted_rating', '-pk')
+        )
+        assert_same(ReviewSerializer, ReviewRowSerializer, Review.objects.select_related('author'))
+        assert_same(CommentSerializer, CommentRowSerializer, Comment.objects.select_related('author'))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_queries_do_not_depend_on_page(self, client, monkeypatch):
+        from django.db.models import Count
+        from rest_framework.pagination import PageNumberPagination
+        from reviews.models import Review, Title
+
+        call_command('generate_data', users=20, titles=5, reviews=60, comments=60)
+        title = Title.objects.order_by('-rating_count').first()
+        review = Review.objects.annotate(total=Count('comments')).order_by('-total').first()
+        urls = (
+            f'/api/v1/titles/{title.pk}/reviews/',
+            f'/api/v1/titles/{title.pk}/reviews/?cursor=',
+            f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/',
+        )
+        for url in urls:
+            monkeypatch.setattr(PageNumberPagination, 'page_size', 1)
+            single = count_queries(client, url)
+            monkeypatch.setattr(PageNumberPagination, 'page_size', 20)
+            assert count_queries(client, url) == single, (
+                f'Проверьте, что число запросов `{url}` не зависит от числа объектов на странице'
+            )
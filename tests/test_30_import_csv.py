@@ -0,0 +1,128 @@
+import csv
+import gzip
+import shutil
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+
+DATA_DIR = Path(settings.BASE_DIR) / 'static' / 'data'
+FIRST_FILES = ('category', 'genre', 'users')
+LATER_FILES = ('titles', 'genre_title', 'review', 'comments')
+
+
+def copy_data(target, names=FIRST_FILES + LATER_FILES, compress=False):
+    target.mkdir()
+    for name in names:
+        source = DATA_DIR / f'{name}.csv'
+        if not compress:
+            shutil.copy(source, target / f'{name}.csv')
+            continue
+        with open(source, 'rb') as plain:
+            with gzip.open(target / f'{name}.csv.gz', 'wb') as compressed:
+                shutil.copyfileobj(plain, compressed)
+    return str(target)
+
+
+def file_counts():
+    counts = {}
+    for name in FIRST_FILES + LATER_FILES:
+        with open(DATA_DIR / f'{name}.csv', encoding='utf8', newline='') as csv_file:
+            counts[name] = sum(1 for _ in csv.DictReader(csv_file))
+    return counts
+
+
+def table_counts():
+    from reviews.management.commands.import_csv import ALLOWED_FILENAMES
+
+    return {
+        name: ALLOWED_FILENAMES[name].objects.count()
+        for name in FIRST_FILES + LATER_FILES
+    }
+
+
+def assert_imported(message):
+    from reviews.models import Title
+
+    assert table_counts() == file_counts(), message
+    title = Title.objects.filter(rating_count__gt=0).first()
+    scores = list(title.reviews.values_list('score', flat=True))
+    assert title.rating == sum(scores) / len(scores), (
+        'Проверьте, что после загрузки `import_csv` пересчитывает рейтинг произведений'
+    )
+
+
+class Test30ImportCsv:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_dependency_order_with_missing_files(self, tmp_path):
+        call_command('import_csv', data_dir=copy_data(tmp_path / 'first', FIRST_FILES), jobs=1)
+        assert table_counts() == {
+            **dict.fromkeys(LATER_FILES, 0),
+            **{name: count for name, count in file_counts().items() if name in FIRST_FILES}
+        }, (
+            'Проверьте, что `import_csv` загружает только найденные файлы'
+        )
+        call_command(
+            'import_csv', data_dir=copy_data(tmp_path / 'later', LATER_FILES), batch_size=5, jobs=1
+        )
+        assert_imported(
+            'Проверьте, что `import_csv` загружает файлы после тех, от которых они зависят, '
+            'и не ждёт отсутствующие'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_gzip(self, tmp_path):
+        call_command('import_csv', data_dir=copy_data(tmp_path / 'data', compress=True), batch_size=5)
+        assert_imported('Проверьте, что `import_csv` загружает файлы .csv.gz')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_batch_size(self, tmp_path, monkeypatch):
+        from django.db.models import QuerySet
+        from reviews.models import Review
+
+        batches = []
+        bulk_create = QuerySet.bulk_create
+
+        def spy(queryset, objs, batch_size=None, **kwargs):
+            batches.append((queryset.model, len(objs), batch_size))
+            return bulk_create(queryset, objs, batch_size=batch_size, **kwargs)
+
+        monkeypatch.setattr(QuerySet, 'bulk_create', spy)
+        call_command('import_csv', data_dir=copy_data(tmp_path / 'data'), batch_size=7, jobs=2)
+        assert_imported('Проверьте, что `import_csv` загружает все строки файлов')
+        assert batches and all(
+            size <= batch_size == 7 for _, size, batch_size in batches
+        ), (
+            'Проверьте, что `import_csv` вставляет строки пачками не больше `--batch-size`'
+        )
+        assert sum(size for model, size, _ in batches if model is Review) == file_counts()['review'], (
+            'Проверьте, что `import_csv` передаёт все строки файла пачками'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_ignore_conflicts(self, tmp_path):
+        data_dir = copy_data(tmp_path / 'data')
+        call_command('import_csv', data_dir=data_dir, batch_size=5)
+        with pytest.raises(CommandError):
+            call_command('import_csv', data_dir=data_dir, batch_size=5)
+        assert table_counts() == file_counts(), (
+            'Проверьте, что при конфликте `import_csv` не загружает файл частично'
+        )
+        call_command('import_csv', data_dir=data_dir, batch_size=5, ignore_conflicts=True)
+        assert_imported('Проверьте, что с `--ignore-conflicts` существующие строки пропускаются')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_dry_run(self, tmp_path):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Без отзывов', year=2000)
+        Title.objects.filter(pk=title.pk).update(rating=3, rating_sum=3, rating_count=1)
+        call_command('import_csv', data_dir=copy_data(tmp_path / 'data'), batch_size=5, dry_run=True)
+        assert table_counts() == {**dict.fromkeys(file_counts(), 0), 'titles': 1}, (
+            'Проверьте, что с `--dry-run` `import_csv` ничего не сохраняет'
+        )
+        assert Title.objects.get(pk=title.pk).rating == 3, (
+            'Проверьте, что с `--dry-run` `import_csv` не пересчитывает рейтинг'
+        )